@@ -36,7 +36,7 @@ class Task:
     completed_at: Optional[str] = None
     error: Optional[str] = None
     result: Optional[Dict] = None
-    current_step: Optional[str] = None  # 当前步骤: detection/masking/compression
+    current_step: Optional[str] = None  # 当前步骤: detection/masking/processing/compression
     current_step_progress: float = 0.0  # 当前步骤进度 0-100
 
     # 处理配置
@@ -243,10 +243,12 @@ class TaskQueue:
 
             # 创建进度回调类
             class APIProgressCallback(ProgressCallback):
-                # 步骤权重：detection(识别)80%、masking(打码)18%、compression(压缩)2%
+                # 步骤权重：detection(识别)80%、masking(打码)18%、compression(压缩)2%；
+                # 单遍处理时识别与打码合并为 processing 步骤，权重为两者之和
                 STEP_WEIGHTS = {
                     'detection': 0.80,
                     'masking': 0.18,
+                    'processing': 0.98,
                     'compression': 0.02
                 }
 
@@ -273,7 +275,7 @@ class TaskQueue:
                     elif phase == 'compress':
                         step_name = 'compression'
                     else:
-                        step_name = 'detection'  # 默认为识别
+                        step_name = 'processing'  # 识别与打码同时进行
 
                     # 计算总进度
                     total_progress = self._calculate_total_progress(step_name, step_progress)
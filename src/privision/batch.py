@@ -23,7 +23,7 @@ class BatchVideoProcessor:
         self,
         detector_type: str = 'phone',
         detector_kwargs: Optional[Dict[str, Any]] = None,
-        blur_method: Literal['gaussian', 'pixelate', 'black'] = 'gaussian',
+        blur_method: Literal['gaussian', 'gaussian_exact', 'pixelate', 'black'] = 'gaussian',
         device: str = 'cpu',
         mode: Literal['frame-by-frame', 'smart'] = 'frame-by-frame',
         enable_rich: bool = False,
@@ -36,7 +36,7 @@ class BatchVideoProcessor:
         Args:
             detector_type: 检测器类型 ('phone', 'keyword', 'idcard')
             detector_kwargs: 检测器参数（字典）
-            blur_method: 打码方式 ('gaussian', 'pixelate', 'black')
+            blur_method: 打码方式 ('gaussian', 'gaussian_exact', 'pixelate', 'black')
             device: 计算设备 ('cpu' 或 'gpu:0', 'gpu:1', ...)
             mode: 处理模式 ('frame-by-frame' 或 'smart')
             enable_rich: 是否启用Rich UI
@@ -248,7 +248,7 @@ def main():
     )
     parser.add_argument(
         '--blur-method',
-        choices=['gaussian', 'pixelate', 'black'],
+        choices=['gaussian', 'gaussian_exact', 'pixelate', 'black'],
         default='gaussian',
         help='打码方式 (默认: gaussian)'
     )
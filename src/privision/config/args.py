@@ -18,15 +18,24 @@ class ProcessConfig:
     detector_kwargs: Dict[str, Any] = field(default_factory=dict)  # 传递给检测器的额外参数
 
     # 打码设置
-    blur_method: Literal['gaussian', 'pixelate', 'black'] = 'gaussian'
+    blur_method: Literal['gaussian', 'gaussian_exact', 'pixelate', 'black'] = 'gaussian'
     blur_strength: int = 51
 
     # 设备设置
     device: str = 'cpu'  # cpu, gpu:0, gpu:1, etc.
 
+    # OCR设置
+    ocr_batch_size: int = 8  # 每次OCR调用处理的帧数（逐帧模式为连续帧，smart模式为采样帧，同时决定单遍处理的预读帧数）
+    frame_diff_threshold: float = 0.0  # 逐帧模式下相似帧复用检测结果的差异阈值（0表示禁用）
+    ocr_max_side: int = 0  # OCR输入最长边上限（像素），超过时先缩小再检测（0表示不缩放）
+    ocr_precision: Literal['fp32', 'fp16'] = 'fp32'  # OCR推理精度（fp16仅在GPU上生效）
+    text_presence_threshold: float = 0.0  # 边缘像素占比低于该值的帧视为无文本，跳过OCR（0表示禁用）
+
     # 智能采样设置（仅smart模式）
     sample_interval: float = 1.0
     buffer_time: Optional[float] = None
+    sample_hash_cache: bool = False  # 按感知哈希缓存采样帧的OCR结果，画面基本不变时跳过OCR
+    single_pass_max_buffer_mb: int = 512  # 单遍处理时待输出帧缓存的内存上限（MB），不足时回退为两遍处理（0表示总是两遍处理）
 
     # 精确定位设置
     precise_location: bool = False
@@ -50,6 +59,30 @@ class ProcessConfig:
         if self.mode not in ['frame-by-frame', 'smart']:
             raise ValueError(f"Invalid mode: {self.mode}")
 
+        # 验证OCR批大小
+        if self.ocr_batch_size < 1:
+            raise ValueError(f"Invalid ocr_batch_size: {self.ocr_batch_size}. Must be >= 1")
+
+        # 验证相似帧差异阈值
+        if self.frame_diff_threshold < 0:
+            raise ValueError(f"Invalid frame_diff_threshold: {self.frame_diff_threshold}. Must be >= 0")
+
+        # 验证OCR输入尺寸上限
+        if self.ocr_max_side < 0:
+            raise ValueError(f"Invalid ocr_max_side: {self.ocr_max_side}. Must be >= 0")
+
+        # 验证OCR推理精度
+        if self.ocr_precision not in ['fp32', 'fp16']:
+            raise ValueError(f"Invalid ocr_precision: {self.ocr_precision}")
+
+        # 验证单遍处理缓存上限
+        if self.single_pass_max_buffer_mb < 0:
+            raise ValueError(f"Invalid single_pass_max_buffer_mb: {self.single_pass_max_buffer_mb}. Must be >= 0")
+
+        # 验证文本预筛阈值
+        if not 0 <= self.text_presence_threshold < 1:
+            raise ValueError(f"Invalid text_presence_threshold: {self.text_presence_threshold}. Must be in [0, 1)")
+
     @property
     def device_type(self) -> Literal['cpu', 'gpu']:
         """获取设备类型"""
@@ -139,9 +172,9 @@ def parse_args():
     parser.add_argument(
         '--blur-method',
         type=str,
-        choices=['gaussian', 'pixelate', 'black'],
+        choices=['gaussian', 'gaussian_exact', 'pixelate', 'black'],
         default='gaussian',
-        help='打码方式: gaussian(高斯模糊), pixelate(像素化), black(黑色遮挡) [默认: gaussian]'
+        help='打码方式: gaussian(高斯模糊，快速近似), gaussian_exact(精确高斯模糊，较慢), pixelate(像素化), black(黑色遮挡) [默认: gaussian]'
     )
 
     parser.add_argument(
@@ -159,6 +192,43 @@ def parse_args():
         help='计算设备: cpu, gpu:0, gpu:1, etc. [默认: cpu]'
     )
 
+    # OCR设置
+    parser.add_argument(
+        '--ocr-batch-size',
+        type=int,
+        default=8,
+        help='OCR批大小：每次OCR调用处理的帧数（逐帧模式为连续帧，smart模式为采样帧；smart单遍处理时最多额外预读这么多个采样间隔的帧，受 --single-pass-max-buffer 限制）[默认: 8]'
+    )
+
+    parser.add_argument(
+        '--frame-diff-threshold',
+        type=float,
+        default=0.0,
+        help='相似帧差异阈值（逐帧模式下与上次OCR帧的32x32灰度平均差异低于该值时复用检测结果，0表示禁用）[默认: 0]'
+    )
+
+    parser.add_argument(
+        '--ocr-max-side',
+        type=int,
+        default=0,
+        help='OCR输入最长边上限（像素），超过时先缩小再检测，检测框映射回原始分辨率，例如 960；0表示不缩放 [默认: 0]'
+    )
+
+    parser.add_argument(
+        '--ocr-precision',
+        type=str,
+        choices=['fp32', 'fp16'],
+        default='fp32',
+        help='OCR推理精度: fp32, fp16（半精度，需GPU和TensorRT，CPU下忽略）[默认: fp32]'
+    )
+
+    parser.add_argument(
+        '--text-presence-threshold',
+        type=float,
+        default=0.0,
+        help='文本预筛阈值（Canny边缘像素占比低于该值的帧视为无文本，直接跳过OCR，例如 0.01；0表示禁用）[默认: 0]'
+    )
+
     # 智能采样设置
     parser.add_argument(
         '--sample-interval',
@@ -174,6 +244,20 @@ def parse_args():
         help='缓冲时间（秒），仅smart模式有效，默认等于采样间隔'
     )
 
+    parser.add_argument(
+        '--sample-hash-cache',
+        action='store_true',
+        help='按感知哈希缓存采样帧的OCR结果，与上一次识别的画面几乎相同时直接复用（适合静态画面较多的视频；小面积文字变化可能被忽略），仅smart模式有效'
+    )
+
+    parser.add_argument(
+        '--single-pass-max-buffer',
+        type=int,
+        default=512,
+        metavar='MB',
+        help='单遍处理时待输出帧缓存的内存上限（MB），识别与打码在一次解码中完成；所需缓存超出上限时回退为两遍处理，0表示总是两遍处理，仅smart模式有效 [默认: 512]'
+    )
+
     # 精确定位设置
     parser.add_argument(
         '--precise-location',
@@ -201,6 +285,12 @@ def parse_args():
         help='启用可视化窗口，实时显示检测结果'
     )
 
+    parser.add_argument(
+        '-y', '--yes',
+        action='store_true',
+        help='输出文件已存在时直接覆盖，不询问'
+    )
+
     args = parser.parse_args()
 
     # 检查输入文件
@@ -215,7 +305,8 @@ def parse_args():
 
     # 检查输出路径
     output_path = Path(args.output)
-    if output_path.exists():
+    # 脚本或 CI 中没有交互终端时不询问，按默认选项覆盖，避免一直阻塞
+    if output_path.exists() and not args.yes and sys.stdin.isatty():
         response = input(f"警告: 输出路径已存在: {args.output}\n是否覆盖? (Y/n): ").strip().lower()
         if response in ['n', 'no']:
             print("操作已取消")
@@ -238,8 +329,15 @@ def parse_args():
         blur_method=args.blur_method,
         blur_strength=args.blur_strength,
         device=args.device,
+        ocr_batch_size=args.ocr_batch_size,
+        frame_diff_threshold=args.frame_diff_threshold,
+        ocr_max_side=args.ocr_max_side,
+        ocr_precision=args.ocr_precision,
+        text_presence_threshold=args.text_presence_threshold,
         sample_interval=args.sample_interval,
         buffer_time=args.buffer_time,
+        sample_hash_cache=args.sample_hash_cache,
+        single_pass_max_buffer_mb=args.single_pass_max_buffer,
         precise_location=args.precise_location,
         precise_max_iterations=args.precise_max_iterations,
         enable_rich=not args.no_rich,
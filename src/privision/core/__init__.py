@@ -4,7 +4,7 @@ from .detector_base import BaseDetector
 from .detector_factory import DetectorFactory, get_detector
 from .detectors import PhoneDetector, KeywordDetector, IDCardDetector
 from .precise_locator import PreciseLocator
-from .blur import apply_blur
+from .blur import apply_blur, apply_blur_regions, apply_blur_rects
 from .video_processor import VideoProcessor
 
 __all__ = [
@@ -17,5 +17,7 @@ __all__ = [
     'KeywordDetector',
     'IDCardDetector',
     'PreciseLocator',
-    'apply_blur'
+    'apply_blur',
+    'apply_blur_regions',
+    'apply_blur_rects'
 ]
@@ -146,11 +146,10 @@ class BboxCalculator:
         Returns:
             裁剪后的图像
         """
-        # 获取矩形边界
-        x_coords = bbox[:, 0]
-        y_coords = bbox[:, 1]
-        x_min, y_min = int(np.min(x_coords)), int(np.min(y_coords))
-        x_max, y_max = int(np.max(x_coords)), int(np.max(y_coords))
+        # 获取矩形边界：顶点很少，转为 Python 标量后用内置 min/max，避免 numpy 逐次调用的开销
+        xs, ys = zip(*bbox.tolist())
+        x_min, y_min = int(min(xs)), int(min(ys))
+        x_max, y_max = int(max(xs)), int(max(ys))
 
         # 边界检查
         h, w = image.shape[:2]
@@ -2,73 +2,475 @@
 打码效果模块
 提供多种打码方式的统一接口
 """
+import math
+import threading
 import cv2
 import numpy as np
-from typing import Literal
+from concurrent.futures import Executor
+from typing import Callable, List, Literal, Optional, Tuple
+
+
+# 线程本地的暂存缓冲区，按需增长后复用，避免每帧为合并模糊区域分配新数组
+_scratch = threading.local()
+
+
+def _scratch_buffer(shape: Tuple[int, ...], dtype: np.dtype) -> np.ndarray:
+    """
+    获取指定尺寸的暂存区视图（当前线程独占，下次调用时内容会被覆盖）
+
+    Args:
+        shape: 所需形状 (h, w[, c])
+        dtype: 数据类型
+
+    Returns:
+        暂存缓冲区左上角对应形状的视图
+    """
+    h, w = shape[:2]
+    buf = getattr(_scratch, 'buf', None)
+    if (
+        buf is None
+        or buf.shape[0] < h
+        or buf.shape[1] < w
+        or buf.shape[2:] != shape[2:]
+        or buf.dtype != dtype
+    ):
+        # 按2的幂增长，减少尺寸波动时的重新分配
+        if buf is not None and buf.shape[2:] == shape[2:] and buf.dtype == dtype:
+            h_cap, w_cap = max(h, buf.shape[0]), max(w, buf.shape[1])
+        else:
+            h_cap, w_cap = h, w
+        buf = np.empty(
+            (1 << (h_cap - 1).bit_length(), 1 << (w_cap - 1).bit_length()) + tuple(shape[2:]),
+            dtype=dtype
+        )
+        _scratch.buf = buf
+    return buf[:h, :w]
+
+
+def _box_kernel_size(strength: int) -> int:
+    """
+    计算三次均值滤波级联近似指定高斯核时使用的均值核大小
+
+    Args:
+        strength: 高斯核大小（奇数）
+
+    Returns:
+        均值核大小（奇数）
+    """
+    # 与 cv2.GaussianBlur(ksize=strength, sigma=0) 推导出的 sigma 对齐：
+    # 三次宽度为 k 的均值滤波，方差为 (k² - 1) / 4
+    sigma = 0.3 * ((strength - 1) * 0.5 - 1) + 0.8
+    return max(3, int(round(math.sqrt(4 * sigma * sigma + 1))) | 1)
+
+
+def _gaussian_approx(roi: np.ndarray, strength: int):
+    """
+    使用三次均值滤波级联原地近似高斯模糊
+
+    均值滤波的开销与核大小无关，三次级联后结果已非常接近高斯分布（中心极限定理），
+    对于打码场景视觉上与 cv2.GaussianBlur 无差别，但大核时速度快数倍
+
+    Args:
+        roi: 待模糊区域（原地修改）
+        strength: 高斯核大小（奇数）
+    """
+    k = _box_kernel_size(strength)
+    for _ in range(3):
+        cv2.blur(roi, (k, k), dst=roi)
+
+
+def _clip_rect(bbox: np.ndarray, width: int, height: int) -> Optional[Tuple[int, int, int, int]]:
+    """
+    计算顶点坐标的外接矩形并裁剪到图像范围内
+
+    Args:
+        bbox: 顶点坐标 [[x1,y1], [x2,y2], ...]（通常为四个顶点）
+        width: 图像宽度
+        height: 图像高度
+
+    Returns:
+        (x_min, y_min, x_max, y_max)，区域为空时返回None
+    """
+    # 获取矩形边界：顶点很少，转为 Python 标量后用内置 min/max，避免 numpy 逐次调用的开销
+    xs, ys = zip(*bbox.tolist())
+    rect = (int(min(xs)), int(min(ys)), int(max(xs)), int(max(ys)))
+    return _clip_xyxy(rect, width, height)
+
+
+def _clip_xyxy(
+    rect: Tuple[int, int, int, int],
+    width: int,
+    height: int
+) -> Optional[Tuple[int, int, int, int]]:
+    """
+    将矩形裁剪到图像范围内
+
+    Args:
+        rect: (x_min, y_min, x_max, y_max)
+        width: 图像宽度
+        height: 图像高度
+
+    Returns:
+        (x_min, y_min, x_max, y_max)，区域为空时返回None
+    """
+    x_min, y_min, x_max, y_max = rect
+
+    # 边界检查
+    x_min = max(0, x_min)
+    y_min = max(0, y_min)
+    x_max = min(width, x_max)
+    y_max = min(height, y_max)
+
+    if x_min >= x_max or y_min >= y_max:
+        return None
+
+    return x_min, y_min, x_max, y_max
+
+
+def _pixelate(roi: np.ndarray, strength: int):
+    """
+    像素化（马赛克）原地处理
+
+    Args:
+        roi: 待处理区域（原地修改）
+        strength: 未使用，与其他打码函数保持相同签名
+    """
+    # 缩小时使用 INTER_AREA（区域平均），放大结果直接写回图像的对应区域，避免中间数组和回写拷贝
+    small = cv2.resize(roi, (10, 10), interpolation=cv2.INTER_AREA)
+    cv2.resize(
+        small,
+        (roi.shape[1], roi.shape[0]),
+        dst=roi,
+        interpolation=cv2.INTER_NEAREST
+    )
+
+
+def _fill_black(roi: np.ndarray, strength: int):
+    """
+    黑色遮挡原地处理
+
+    Args:
+        roi: 待处理区域（原地修改）
+        strength: 未使用，与其他打码函数保持相同签名
+    """
+    roi[:] = 0
+
+
+def _gaussian(roi: np.ndarray, strength: int):
+    """
+    高斯模糊原地处理
+
+    Args:
+        roi: 待处理区域（原地修改）
+        strength: 高斯核大小，偶数时自动加1
+    """
+    if strength % 2 == 0:
+        strength += 1
+    _gaussian_approx(roi, strength)
+
+
+def _gaussian_exact(roi: np.ndarray, strength: int):
+    """
+    精确高斯模糊原地处理（cv2.GaussianBlur，大核时明显慢于近似实现）
+
+    Args:
+        roi: 待处理区域（原地修改）
+        strength: 高斯核大小，偶数时自动加1
+    """
+    if strength % 2 == 0:
+        strength += 1
+    cv2.GaussianBlur(roi, (strength, strength), 0, dst=roi)
+
+
+# 打码方式到处理函数的映射，未知方式按高斯模糊处理
+_BLUR_FUNCS = {
+    'gaussian': _gaussian,
+    'gaussian_exact': _gaussian_exact,
+    'pixelate': _pixelate,
+    'black': _fill_black,
+}
+
+
+class CudaGaussianBlur:
+    """
+    GPU 高斯模糊
+    在 CUDA 设备上执行与 _gaussian 相同的三次均值滤波级联，可作为高斯模糊函数传给 apply_blur_regions；
+    GPU 运算出错时自动回退到 CPU 实现
+    """
+
+    def __init__(self, gpu_id: int = 0):
+        """
+        初始化 GPU 模糊器
+
+        Args:
+            gpu_id: GPU 设备编号
+        """
+        cv2.cuda.setDevice(gpu_id)
+        self._filters = {}  # 均值核大小 -> CUDA 均值滤波器
+        self._gpu_roi = cv2.cuda_GpuMat()
+        self._failed = False
+
+    @staticmethod
+    def is_available() -> bool:
+        """当前 OpenCV 是否带有 CUDA 滤波模块且存在可用的 CUDA 设备"""
+        if not hasattr(cv2, 'cuda') or not hasattr(cv2.cuda, 'createBoxFilter'):
+            return False
+        try:
+            return cv2.cuda.getCudaEnabledDeviceCount() > 0
+        except cv2.error:
+            return False
+
+    def __call__(self, roi: np.ndarray, strength: int):
+        """
+        高斯模糊原地处理
+
+        Args:
+            roi: 待处理的 BGR 区域（原地修改）
+            strength: 高斯核大小，偶数时自动加1
+        """
+        if self._failed or roi.ndim != 3 or roi.shape[2] != 3:
+            _gaussian(roi, strength)
+            return
+
+        if strength % 2 == 0:
+            strength += 1
+
+        try:
+            k = _box_kernel_size(strength)
+            box_filter = self._filters.get(k)
+            if box_filter is None:
+                # CUDA 均值滤波不支持三通道，统一转为 BGRA 处理
+                box_filter = cv2.cuda.createBoxFilter(cv2.CV_8UC4, cv2.CV_8UC4, (k, k))
+                self._filters[k] = box_filter
+
+            self._gpu_roi.upload(roi)
+            gpu_image = cv2.cuda.cvtColor(self._gpu_roi, cv2.COLOR_BGR2BGRA)
+            for _ in range(3):
+                gpu_image = box_filter.apply(gpu_image)
+            roi[:] = cv2.cuda.cvtColor(gpu_image, cv2.COLOR_BGRA2BGR).download()
+        except cv2.error:
+            self._failed = True
+            _gaussian(roi, strength)
+
+
+def _blur_rect(
+    image: np.ndarray,
+    rect: Tuple[int, int, int, int],
+    method: str,
+    strength: int
+):
+    """
+    对图像中的矩形区域原地打码
+
+    Args:
+        image: 图像（原地修改）
+        rect: (x_min, y_min, x_max, y_max)，已裁剪到图像范围内
+        method: 打码方式 (gaussian, gaussian_exact, pixelate, black)
+        strength: 模糊强度 (仅对gaussian有效)
+    """
+    x_min, y_min, x_max, y_max = rect
+    _BLUR_FUNCS.get(method, _gaussian)(image[y_min:y_max, x_min:x_max], strength)
+
+
+def _rects_disjoint(rects: List[Tuple[int, int, int, int]]) -> bool:
+    """
+    检查矩形是否两两不相交
+
+    Args:
+        rects: (x_min, y_min, x_max, y_max) 列表
+
+    Returns:
+        是否两两不相交
+    """
+    for i, (ax_min, ay_min, ax_max, ay_max) in enumerate(rects):
+        for bx_min, by_min, bx_max, by_max in rects[i + 1:]:
+            if ax_min < bx_max and bx_min < ax_max and ay_min < by_max and by_min < ay_max:
+                return False
+    return True
+
+
+def _blur_rects(
+    image: np.ndarray,
+    rects: List[Tuple[int, int, int, int]],
+    method: str,
+    strength: int,
+    executor: Optional[Executor],
+    gaussian: Callable[[np.ndarray, int], None] = _gaussian
+):
+    """
+    逐个区域原地打码
+
+    提供线程池且区域两两不相交时并行处理（OpenCV 运算期间释放 GIL，可利用多核）；
+    区域重叠时并行写回会相互干扰，仍按顺序处理
+
+    Args:
+        image: 图像（原地修改）
+        rects: 已裁剪的矩形列表
+        method: 打码方式 (gaussian, gaussian_exact, pixelate, black)
+        strength: 模糊强度 (仅对gaussian有效)
+        executor: 线程池，为None时顺序处理
+        gaussian: 高斯模糊使用的处理函数
+    """
+    blur_func = _BLUR_FUNCS.get(method, gaussian)
+    if blur_func is _gaussian:
+        blur_func = gaussian
+
+    if executor is not None and len(rects) > 1 and method != 'black' and _rects_disjoint(rects):
+        futures = [
+            executor.submit(blur_func, image[y_min:y_max, x_min:x_max], strength)
+            for x_min, y_min, x_max, y_max in rects
+        ]
+        for future in futures:
+            future.result()
+        return
+
+    for x_min, y_min, x_max, y_max in rects:
+        blur_func(image[y_min:y_max, x_min:x_max], strength)
 
 
 def apply_blur(
     image: np.ndarray,
     bbox: np.ndarray,
-    method: Literal['gaussian', 'pixelate', 'black'] = 'gaussian',
+    method: Literal['gaussian', 'gaussian_exact', 'pixelate', 'black'] = 'gaussian',
     strength: int = 51
 ) -> np.ndarray:
     """
-    在指定区域应用打码效果
+    在指定区域原地应用打码效果（直接修改传入的图像，不产生整帧拷贝）
 
     Args:
-        image: 原始图像
+        image: 原始图像（会被原地修改，需要保留原图时请先自行拷贝）
         bbox: 四个顶点坐标 [[x1,y1], [x2,y2], [x3,y3], [x4,y4]]
-        method: 打码方式 (gaussian, pixelate, black)
+        method: 打码方式 (gaussian, gaussian_exact, pixelate, black)
         strength: 模糊强度 (仅对gaussian有效)
 
     Returns:
-        打码后的图像
+        打码后的图像（即传入的 image）
     """
-    # 获取矩形边界
-    x_coords = bbox[:, 0]
-    y_coords = bbox[:, 1]
-    x_min, y_min = int(np.min(x_coords)), int(np.min(y_coords))
-    x_max, y_max = int(np.max(x_coords)), int(np.max(y_coords))
+    h, w = image.shape[:2]
+    rect = _clip_rect(bbox, w, h)
+    if rect is not None:
+        _blur_rect(image, rect, method, strength)
 
-    # 边界检查
+    return image
+
+
+def apply_blur_regions(
+    image: np.ndarray,
+    bboxes: List[np.ndarray],
+    method: Literal['gaussian', 'gaussian_exact', 'pixelate', 'black'] = 'gaussian',
+    strength: int = 51,
+    executor: Optional[Executor] = None,
+    gpu_blur: Optional[CudaGaussianBlur] = None
+) -> np.ndarray:
+    """
+    对多个区域原地统一打码
+
+    高斯模糊时，位置集中的多个区域只对其外接矩形模糊一次，再按各区域写回，
+    避免重叠部分被重复模糊；区域分散时（外接矩形面积超过各区域面积之和的2倍）逐个打码。
+    像素化和黑色遮挡逐个区域处理
+
+    Args:
+        image: 原始图像（会被原地修改，需要保留原图时请先自行拷贝）
+        bboxes: 顶点坐标列表，每项为 [[x1,y1], [x2,y2], [x3,y3], [x4,y4]]
+        method: 打码方式 (gaussian, gaussian_exact, pixelate, black)
+        strength: 模糊强度 (仅对gaussian有效)
+        executor: 线程池，提供时互不重叠的区域并行打码
+        gpu_blur: GPU 模糊器，提供时 gaussian 方式在 GPU 上顺序执行（不使用线程池）
+
+    Returns:
+        打码后的图像（即传入的 image）
+    """
     h, w = image.shape[:2]
-    x_min = max(0, x_min)
-    y_min = max(0, y_min)
-    x_max = min(w, x_max)
-    y_max = min(h, y_max)
+    rects = [rect for rect in (_clip_rect(bbox, w, h) for bbox in bboxes) if rect is not None]
+    return _blur_clipped_rects(image, rects, method, strength, executor, gpu_blur)
 
-    if x_min >= x_max or y_min >= y_max:
+
+def apply_blur_rects(
+    image: np.ndarray,
+    rects: List[Tuple[int, int, int, int]],
+    method: Literal['gaussian', 'gaussian_exact', 'pixelate', 'black'] = 'gaussian',
+    strength: int = 51,
+    executor: Optional[Executor] = None,
+    gpu_blur: Optional[CudaGaussianBlur] = None
+) -> np.ndarray:
+    """
+    对多个已知外接矩形的区域原地统一打码，与 apply_blur_regions 相同，但省去从顶点计算外接矩形
+
+    Args:
+        image: 原始图像（会被原地修改，需要保留原图时请先自行拷贝）
+        rects: 外接矩形列表，每项为 (x_min, y_min, x_max, y_max)
+        method: 打码方式 (gaussian, gaussian_exact, pixelate, black)
+        strength: 模糊强度 (仅对gaussian有效)
+        executor: 线程池，提供时互不重叠的区域并行打码
+        gpu_blur: GPU 模糊器，提供时 gaussian 方式在 GPU 上顺序执行（不使用线程池）
+
+    Returns:
+        打码后的图像（即传入的 image）
+    """
+    h, w = image.shape[:2]
+    rects = [rect for rect in (_clip_xyxy(rect, w, h) for rect in rects) if rect is not None]
+    return _blur_clipped_rects(image, rects, method, strength, executor, gpu_blur)
+
+
+def _blur_clipped_rects(
+    image: np.ndarray,
+    rects: List[Tuple[int, int, int, int]],
+    method: str,
+    strength: int,
+    executor: Optional[Executor],
+    gpu_blur: Optional[CudaGaussianBlur]
+) -> np.ndarray:
+    """
+    对已裁剪的矩形区域原地统一打码（apply_blur_regions / apply_blur_rects 的共同实现）
+
+    Args:
+        image: 图像（原地修改）
+        rects: 已裁剪的矩形列表
+        method: 打码方式 (gaussian, gaussian_exact, pixelate, black)
+        strength: 模糊强度 (仅对gaussian有效)
+        executor: 线程池，为None时顺序处理
+        gpu_blur: GPU 模糊器，为None时在CPU上处理
+
+    Returns:
+        打码后的图像（即传入的 image）
+    """
+    if not rects:
         return image
 
-    # 提取区域
-    roi = image[y_min:y_max, x_min:x_max]
+    # 高斯模糊使用的处理函数，默认的近似实现可交给 GPU 执行
+    gaussian = _BLUR_FUNCS.get(method, _gaussian)
+    if gpu_blur is not None and gaussian is _gaussian:
+        gaussian = gpu_blur
+        executor = None
 
-    if roi.size == 0:
+    if len(rects) == 1 or method in ('pixelate', 'black'):
+        _blur_rects(image, rects, method, strength, executor, gaussian)
         return image
 
-    # 应用打码效果
-    if method == 'gaussian':
-        # 高斯模糊
-        # 确保strength为奇数
-        if strength % 2 == 0:
-            strength += 1
-        blurred_roi = cv2.GaussianBlur(roi, (strength, strength), 0)
-    elif method == 'pixelate':
-        # 像素化（马赛克）
-        small = cv2.resize(roi, (10, 10), interpolation=cv2.INTER_LINEAR)
-        blurred_roi = cv2.resize(small, (roi.shape[1], roi.shape[0]), interpolation=cv2.INTER_NEAREST)
-    elif method == 'black':
-        # 黑色遮挡
-        blurred_roi = np.zeros_like(roi)
-    else:
-        # 默认使用高斯模糊
-        if strength % 2 == 0:
-            strength += 1
-        blurred_roi = cv2.GaussianBlur(roi, (strength, strength), 0)
+    # 所有区域的外接矩形
+    union_x_min = min(rect[0] for rect in rects)
+    union_y_min = min(rect[1] for rect in rects)
+    union_x_max = max(rect[2] for rect in rects)
+    union_y_max = max(rect[3] for rect in rects)
+
+    union_area = (union_x_max - union_x_min) * (union_y_max - union_y_min)
+    rects_area = sum((x_max - x_min) * (y_max - y_min) for x_min, y_min, x_max, y_max in rects)
+
+    if union_area > 2 * rects_area:
+        # 区域分散，合并模糊的面积过大，逐个打码
+        _blur_rects(image, rects, method, strength, executor, gaussian)
+        return image
+
+    # 外接矩形只模糊一次，再按各区域写回
+    union = image[union_y_min:union_y_max, union_x_min:union_x_max]
+    blurred = _scratch_buffer(union.shape, union.dtype)
+    np.copyto(blurred, union)
+    gaussian(blurred, strength)
 
-    # 替换区域
-    result = image.copy()
-    result[y_min:y_max, x_min:x_max] = blurred_roi
+    for x_min, y_min, x_max, y_max in rects:
+        image[y_min:y_max, x_min:x_max] = blurred[
+            y_min - union_y_min:y_max - union_y_min,
+            x_min - union_x_min:x_max - union_x_min
+        ]
 
-    return result
+    return image
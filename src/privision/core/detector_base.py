@@ -3,7 +3,8 @@
 定义所有检测器的通用接口
 """
 from abc import ABC, abstractmethod
-from typing import List, Tuple, Optional
+from functools import lru_cache
+from typing import List, Tuple, Optional, Pattern
 
 
 class BaseDetector(ABC):
@@ -12,6 +13,19 @@ class BaseDetector(ABC):
     所有具体的检测器都应该继承这个类并实现其抽象方法
     """
 
+    # 目标文本至少包含的数字个数，用于 may_contain_pattern() 快速预筛（0表示不限制）
+    MIN_DIGITS = 0
+
+    # contains_pattern_cached() 缓存的最大文本数
+    PATTERN_CACHE_SIZE = 4096
+
+    # contains_pattern_batch() 整批预筛使用的正则（严格/非严格模式，为None时不预筛）
+    PRESCREEN_PATTERN: Optional[Pattern] = None
+    PRESCREEN_PATTERN_STRICT: Optional[Pattern] = None
+
+    # 预筛前从文本中移除的分隔符（为None时不移除）
+    SEPARATOR_PATTERN: Optional[Pattern] = None
+
     @property
     @abstractmethod
     def name(self) -> str:
@@ -48,6 +62,63 @@ class BaseDetector(ABC):
         """
         pass
 
+    def contains_pattern_cached(self, text: str, strict: bool = True) -> bool:
+        """
+        带缓存的 contains_pattern()：相邻帧的 OCR 文本大量重复，相同文本无需重复执行匹配
+
+        Args:
+            text: 待检测的文本
+            strict: 是否使用严格模式
+
+        Returns:
+            是否包含目标模式
+        """
+        cache = self.__dict__.get('_pattern_cache')
+        if cache is None:
+            cache = self._pattern_cache = lru_cache(maxsize=self.PATTERN_CACHE_SIZE)(self.contains_pattern)
+        return cache(text, strict)
+
+    def clear_pattern_cache(self):
+        """清空 contains_pattern_cached() 的缓存（检测规则变化后调用）"""
+        self.__dict__.pop('_pattern_cache', None)
+
+    def contains_pattern_batch(self, texts: List[str], strict: bool = True) -> List[bool]:
+        """
+        批量检查多个文本中是否包含目标模式
+
+        设置了预筛正则时，去除分隔符后以换行拼接，先对整批文本只做一次正则搜索
+        （预筛正则不应跨越换行匹配），整批都没有候选时直接返回，大多数不含目标的帧只需一次匹配
+
+        Args:
+            texts: 待检测的文本列表
+            strict: 是否使用严格模式
+
+        Returns:
+            与输入一一对应的检查结果列表
+        """
+        pattern = self.PRESCREEN_PATTERN_STRICT if strict else self.PRESCREEN_PATTERN
+        if pattern is not None:
+            separator = self.SEPARATOR_PATTERN
+            cleaned = '\n'.join(separator.sub('', text) if separator else text for text in texts)
+            if pattern.search(cleaned) is None:
+                return [False] * len(texts)
+
+        return [self.contains_pattern_cached(text, strict) for text in texts]
+
+    def may_contain_pattern(self, text: str) -> bool:
+        """
+        快速判断文本是否可能包含目标模式（只检查必要条件，可能误判为True，不会漏判）
+
+        Args:
+            text: 待检测的文本
+
+        Returns:
+            是否可能包含目标模式
+        """
+        if self.MIN_DIGITS <= 0:
+            return True
+        return sum(map(str.isdigit, text)) >= self.MIN_DIGITS
+
     @abstractmethod
     def find_patterns(self, text: str) -> List[str]:
         """
@@ -18,6 +18,16 @@ class IDCardDetector(BaseDetector):
     # 严格模式：前后必须是非数字字符
     IDCARD_PATTERN_STRICT = re.compile(r'(?<!\d)\d{17}[\dXx](?!\d)')
 
+    # 匹配前需要移除的分隔符（空格、横线、全角空格）
+    SEPARATOR_PATTERN = re.compile(r'[\s\-\u3000]')
+
+    # 批量匹配的整批预筛
+    PRESCREEN_PATTERN = IDCARD_PATTERN
+    PRESCREEN_PATTERN_STRICT = IDCARD_PATTERN_STRICT
+
+    # 身份证号前17位为数字（末位可能为X）
+    MIN_DIGITS = 17
+
     @property
     def name(self) -> str:
         """检测器名称"""
@@ -43,7 +53,7 @@ class IDCardDetector(BaseDetector):
             return False
 
         # 移除空格、横线等分隔符后再匹配
-        cleaned_text = re.sub(r'[\s\-\u3000]', '', text)
+        cleaned_text = self.SEPARATOR_PATTERN.sub('', text)
 
         # 使用严格模式或普通模式
         pattern = self.IDCARD_PATTERN_STRICT if strict else self.IDCARD_PATTERN
@@ -112,7 +122,7 @@ class IDCardDetector(BaseDetector):
             return []
 
         # 移除空格、横线等分隔符后再匹配
-        cleaned_text = re.sub(r'[\s\-\u3000]', '', text)
+        cleaned_text = self.SEPARATOR_PATTERN.sub('', text)
         matches = self.IDCARD_PATTERN.findall(cleaned_text)
 
         # 只返回有效的身份证号
@@ -137,13 +147,13 @@ class IDCardDetector(BaseDetector):
             return []
 
         # 移除空格、横线等分隔符后再匹配
-        cleaned_text = re.sub(r'[\s\-\u3000]', '', text)
+        cleaned_text = self.SEPARATOR_PATTERN.sub('', text)
 
         # 建立清理后位置到原始位置的映射
         cleaned_to_original = []
         original_idx = 0
         for char in text:
-            if not re.match(r'[\s\-\u3000]', char):
+            if not self.SEPARATOR_PATTERN.match(char):
                 cleaned_to_original.append(original_idx)
             original_idx += 1
 
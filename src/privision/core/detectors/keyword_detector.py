@@ -37,6 +37,9 @@ class KeywordDetector(BaseDetector):
                 pattern = re.compile(r'\b' + escaped + r'\b', flags)
             self.patterns.append((keyword, pattern))
 
+        # 关键字变化后缓存的匹配结果失效
+        self.clear_pattern_cache()
+
     @property
     def name(self) -> str:
         """检测器名称"""
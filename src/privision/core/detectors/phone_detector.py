@@ -17,6 +17,16 @@ class PhoneDetector(BaseDetector):
     # 严格模式：手机号前后必须是非数字字符或字符串边界
     PHONE_PATTERN_STRICT = re.compile(r'(?<!\d)1[3-9]\d{9}(?!\d)')
 
+    # 匹配前需要移除的分隔符（空格、横线、全角空格）
+    SEPARATOR_PATTERN = re.compile(r'[\s\-\u3000]')
+
+    # 批量匹配的整批预筛
+    PRESCREEN_PATTERN = PHONE_PATTERN
+    PRESCREEN_PATTERN_STRICT = PHONE_PATTERN_STRICT
+
+    # 手机号共11位数字
+    MIN_DIGITS = 11
+
     @property
     def name(self) -> str:
         """检测器名称"""
@@ -42,7 +52,7 @@ class PhoneDetector(BaseDetector):
             return False
 
         # 移除空格、横线等分隔符后再匹配
-        cleaned_text = re.sub(r'[\s\-\u3000]', '', text)
+        cleaned_text = self.SEPARATOR_PATTERN.sub('', text)
 
         # 使用严格模式或普通模式
         pattern = self.PHONE_PATTERN_STRICT if strict else self.PHONE_PATTERN
@@ -114,7 +124,7 @@ class PhoneDetector(BaseDetector):
         if not text:
             return []
         # 移除空格、横线等分隔符后再匹配
-        cleaned_text = re.sub(r'[\s\-\u3000]', '', text)
+        cleaned_text = self.SEPARATOR_PATTERN.sub('', text)
         return self.PHONE_PATTERN.findall(cleaned_text)
 
     def find_pattern_positions(self, text: str) -> List[Tuple[str, int, int]]:
@@ -132,13 +142,13 @@ class PhoneDetector(BaseDetector):
             return []
 
         # 移除空格、横线等分隔符后再匹配
-        cleaned_text = re.sub(r'[\s\-\u3000]', '', text)
+        cleaned_text = self.SEPARATOR_PATTERN.sub('', text)
 
         # 建立清理后位置到原始位置的映射
         cleaned_to_original = []  # cleaned_to_original[i] = 原始文本中的位置
         original_idx = 0
         for char in text:
-            if not re.match(r'[\s\-\u3000]', char):  # 不是要清理的字符
+            if not self.SEPARATOR_PATTERN.match(char):  # 不是要清理的字符
                 cleaned_to_original.append(original_idx)
             original_idx += 1
 
@@ -3,10 +3,20 @@
 通过迭代验证OCR结果，精确定位目标模式在图像中的位置
 """
 import numpy as np
-from typing import Tuple, Optional, Callable
+from typing import List, Tuple, Optional, Callable
 from privision.core.bbox_calculator import BboxCalculator
 from privision.core.detector_base import BaseDetector
 
+
+# 调整策略对应的左右边界移动比例及调试说明
+_ADJUSTMENTS = {
+    "expand_left": (-0.15, 0.0, "向左扩展"),      # 目标内容被截断左侧
+    "expand_right": (0.0, 0.15, "向右扩展"),      # 目标内容被截断右侧
+    "shrink_left": (0.1, 0.0, "左边界右移"),      # 包含了前缀
+    "shrink_right": (0.0, -0.1, "右边界左移"),    # 包含了后缀
+}
+
+
 class PreciseLocator:
     """精确定位器 - 通过迭代验证精确定位目标模式"""
 
@@ -61,6 +71,138 @@ class PreciseLocator:
         Returns:
             (精确的模式bbox, 识别到的文本) 元组，如果失败返回None
         """
+        return self.refine_pattern_bboxes(
+            image, [(original_bbox, original_text)], debug=debug
+        )[0]
+
+    def refine_pattern_bboxes(
+        self,
+        image: np.ndarray,
+        candidates: List[Tuple[np.ndarray, str]],
+        debug: bool = False
+    ) -> List[Optional[Tuple[np.ndarray, str]]]:
+        """
+        批量精确定位同一图像中多个目标模式的bbox
+
+        所有候选按相同步调迭代，每轮将仍需调整的候选区域合并为一次批量OCR调用，
+        单个候选的调整策略与 refine_pattern_bbox 相同
+
+        Args:
+            image: 原始图像
+            candidates: (原始bbox, 原始文本) 列表
+            debug: 是否输出调试信息
+
+        Returns:
+            与 candidates 一一对应的 (精确的模式bbox, 识别到的文本) 列表，
+            无需或无法精确定位的项为None
+        """
+        results: List[Optional[Tuple[np.ndarray, str]]] = [None] * len(candidates)
+
+        # 仍在迭代的候选，每项为 [候选下标, 目标模式文本, 当前bbox, 最后识别到的文本]
+        active = []
+        for idx, (original_bbox, original_text) in enumerate(candidates):
+            initial = self._initial_pattern_bbox(original_bbox, original_text, debug)
+            if initial is not None:
+                pattern_text, current_bbox = initial
+                active.append([idx, pattern_text, current_bbox, pattern_text])
+
+        # 3. 迭代验证和调整
+        for iteration in range(self.max_iterations):
+            if not active:
+                break
+
+            # 裁剪所有候选的图像区域
+            pending = []
+            cropped_images = []
+            for state in active:
+                cropped_image = BboxCalculator.crop_image_by_bbox(image, state[2])
+                if cropped_image.size == 0:
+                    if debug:
+                        print(f"  [PreciseLocator] 迭代 {iteration + 1}: 裁剪区域为空")
+                    results[state[0]] = (state[2], state[3])
+                    continue
+                pending.append(state)
+                cropped_images.append(cropped_image)
+
+            active = []
+            if not cropped_images:
+                break
+
+            # 对所有裁剪区域进行一次批量OCR识别
+            batch_detections = self.ocr_detector.detect_text_batch(cropped_images)
+
+            # 通知UI OCR调用（精确定位的额外调用）
+            if self.progress_callback and hasattr(self.progress_callback, 'on_ocr_call'):
+                for _ in cropped_images:
+                    self.progress_callback.on_ocr_call()
+
+            for state, detections in zip(pending, batch_detections):
+                idx, pattern_text, current_bbox, _ = state
+
+                if not detections:
+                    if debug:
+                        print(f"  [PreciseLocator] 迭代 {iteration + 1}: OCR未识别到文本，停止迭代")
+                    results[idx] = (current_bbox, state[3])
+                    continue
+
+                # 取置信度最高的识别结果
+                _, detected_text, confidence = max(detections, key=lambda x: x[2])
+                state[3] = detected_text
+
+                if debug:
+                    print(f"  [PreciseLocator] 迭代 {iteration + 1}: 识别到 '{detected_text}' (置信度: {confidence:.3f})")
+
+                # 分析识别结果
+                adjustment = self._analyze_detection(pattern_text, detected_text)
+
+                if adjustment in _ADJUSTMENTS:
+                    left_shift_ratio, right_shift_ratio, description = _ADJUSTMENTS[adjustment]
+                    if debug:
+                        print(f"  [PreciseLocator] 调整: {description}")
+                    state[2] = BboxCalculator.adjust_bbox_horizontally(
+                        current_bbox,
+                        left_shift_ratio=left_shift_ratio,
+                        right_shift_ratio=right_shift_ratio
+                    )
+                    active.append(state)
+                    continue
+
+                if debug:
+                    if adjustment == "perfect":
+                        print(f"  [PreciseLocator] ✓ 精确定位成功！")
+                        print(f"  [PreciseLocator]   原始: '{candidates[idx][1]}' → 精确定位后: '{detected_text}'")
+                        print(f"  [PreciseLocator]   最终bbox: {current_bbox.tolist()}")
+                    else:
+                        print(f"  [PreciseLocator] 无法进一步优化，使用当前结果")
+
+                # 精确匹配或无法判断如何调整，返回当前bbox和识别的文本
+                results[idx] = (current_bbox, detected_text)
+
+        # 迭代结束，返回当前bbox（即使没有完美匹配，也返回最后的结果）
+        for idx, _, current_bbox, last_detected in active:
+            if debug:
+                print(f"  [PreciseLocator] 达到最大迭代次数，返回当前结果")
+            results[idx] = (current_bbox, last_detected)
+
+        return results
+
+    def _initial_pattern_bbox(
+        self,
+        original_bbox: np.ndarray,
+        original_text: str,
+        debug: bool = False
+    ) -> Optional[Tuple[str, np.ndarray]]:
+        """
+        在原始文本中查找目标模式，并按字符比例切分出初始bbox
+
+        Args:
+            original_bbox: 原始文本的bbox
+            original_text: 原始文本内容（包含目标模式）
+            debug: 是否输出调试信息
+
+        Returns:
+            (目标模式文本, 初始bbox) 元组，无需精确定位时返回None
+        """
         # 1. 查找目标模式在原始文本中的位置
         pattern_positions = self.detector.find_pattern_positions(original_text)
         if not pattern_positions:
@@ -100,99 +242,7 @@ class PreciseLocator:
         if debug:
             print(f"  [PreciseLocator] 初始切分bbox: {current_bbox.tolist()}")
 
-        # 3. 迭代验证和调整
-        for iteration in range(self.max_iterations):
-            # 裁剪图像区域
-            cropped_image = BboxCalculator.crop_image_by_bbox(image, current_bbox)
-
-            if cropped_image.size == 0:
-                if debug:
-                    print(f"  [PreciseLocator] 迭代 {iteration + 1}: 裁剪区域为空")
-                break
-
-            # 对裁剪区域进行OCR识别
-            detections = self.ocr_detector.detect_text(cropped_image)
-
-            # 通知UI OCR调用（精确定位的额外调用）
-            if self.progress_callback and hasattr(self.progress_callback, 'on_ocr_call'):
-                self.progress_callback.on_ocr_call()
-
-            if not detections:
-                if debug:
-                    print(f"  [PreciseLocator] 迭代 {iteration + 1}: OCR未识别到文本，停止迭代")
-                break
-
-            # 取置信度最高的识别结果
-            detections_sorted = sorted(detections, key=lambda x: x[2], reverse=True)
-            _, detected_text, confidence = detections_sorted[0]
-
-            if debug:
-                print(f"  [PreciseLocator] 迭代 {iteration + 1}: 识别到 '{detected_text}' (置信度: {confidence:.3f})")
-
-            # 分析识别结果
-            adjustment = self._analyze_detection(pattern_text, detected_text)
-
-            if adjustment == "perfect":
-                # 精确匹配，返回当前bbox和识别的文本
-                if debug:
-                    print(f"  [PreciseLocator] ✓ 精确定位成功！")
-                    print(f"  [PreciseLocator]   原始: '{original_text}' → 精确定位后: '{detected_text}'")
-                    print(f"  [PreciseLocator]   最终bbox: {current_bbox.tolist()}")
-                return current_bbox, detected_text
-
-            elif adjustment == "expand_left":
-                # 需要向左扩展（目标内容被截断左侧）
-                if debug:
-                    print(f"  [PreciseLocator] 调整: 向左扩展")
-                current_bbox = BboxCalculator.adjust_bbox_horizontally(
-                    current_bbox,
-                    left_shift_ratio=-0.15,
-                    right_shift_ratio=0.0
-                )
-
-            elif adjustment == "expand_right":
-                # 需要向右扩展（目标内容被截断右侧）
-                if debug:
-                    print(f"  [PreciseLocator] 调整: 向右扩展")
-                current_bbox = BboxCalculator.adjust_bbox_horizontally(
-                    current_bbox,
-                    left_shift_ratio=0.0,
-                    right_shift_ratio=0.15
-                )
-
-            elif adjustment == "shrink_left":
-                # 需要右移左边界（包含了前缀）
-                if debug:
-                    print(f"  [PreciseLocator] 调整: 左边界右移")
-                current_bbox = BboxCalculator.adjust_bbox_horizontally(
-                    current_bbox,
-                    left_shift_ratio=0.1,
-                    right_shift_ratio=0.0
-                )
-
-            elif adjustment == "shrink_right":
-                # 需要左移右边界（包含了后缀）
-                if debug:
-                    print(f"  [PreciseLocator] 调整: 右边界左移")
-                current_bbox = BboxCalculator.adjust_bbox_horizontally(
-                    current_bbox,
-                    left_shift_ratio=0.0,
-                    right_shift_ratio=-0.1
-                )
-
-            else:
-                # 无法判断如何调整，返回当前bbox
-                if debug:
-                    print(f"  [PreciseLocator] 无法进一步优化，使用当前结果")
-                last_detected = detected_text if 'detected_text' in locals() else pattern_text
-                return current_bbox, last_detected
-
-        # 迭代结束，返回当前bbox（即使没有完美匹配，也返回最后的结果）
-        if debug:
-            print(f"  [PreciseLocator] 达到最大迭代次数，返回当前结果")
-        # 返回当前bbox和最后识别到的文本（如果有的话）
-        last_detected = detected_text if 'detected_text' in locals() else pattern_text
-        return current_bbox, last_detected
+        return pattern_text, current_bbox
 
     def _analyze_detection(
         self,
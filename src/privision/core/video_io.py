@@ -0,0 +1,427 @@
+"""
+视频读写模块
+提供后台线程解码/编码的帧读取器和写入器，使解码、检测、编码三个阶段并行执行，
+以及通过管道直接向 FFmpeg 输送原始帧的写入器
+"""
+import queue
+from collections import deque
+import subprocess
+import sys
+import tempfile
+import threading
+from typing import Optional, Tuple
+
+import cv2
+import numpy as np
+
+
+# 队列结束标记
+_EOF = object()
+
+
+class FramePool:
+    """
+    帧缓冲池
+    写入器编码完成的帧放回池中，读取器解码下一帧时直接复用其内存，
+    避免每帧分配和释放整帧大小的数组（可在读取线程和写入线程间共享）
+    """
+
+    def __init__(self, max_size: int = 32):
+        """
+        初始化缓冲池
+
+        Args:
+            max_size: 池中最多保留的空闲帧数
+        """
+        self._free: deque = deque()
+        self._max_size = max_size
+
+    def acquire(self) -> Optional[np.ndarray]:
+        """
+        取出一个空闲帧
+
+        Returns:
+            空闲帧，池为空时返回 None
+        """
+        try:
+            return self._free.pop()
+        except IndexError:
+            return None
+
+    def release(self, frame: np.ndarray):
+        """
+        归还不再使用的帧（归还后调用方不应再访问该帧）
+
+        Args:
+            frame: 帧
+        """
+        if len(self._free) < self._max_size:
+            self._free.append(frame)
+
+
+class ThreadedFrameReader:
+    """
+    后台线程帧读取器
+    在独立线程中循环调用 cap.read()，通过有界队列向处理线程提供帧，
+    接口与 cv2.VideoCapture.read() 一致
+    """
+
+    def __init__(self, cap: cv2.VideoCapture, queue_size: int = 8, pool: Optional[FramePool] = None):
+        """
+        初始化帧读取器并启动读取线程
+
+        Args:
+            cap: 已打开的视频捕获对象（启动后只能由读取线程访问）
+            queue_size: 预读队列长度，队列满时读取线程阻塞（自动背压）
+            pool: 帧缓冲池，提供时优先解码到池中的空闲帧
+        """
+        self._cap = cap
+        self._pool = pool
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._stop = threading.Event()
+        self._finished = False
+        self._error: Optional[BaseException] = None
+
+        self._thread = threading.Thread(target=self._run, daemon=True, name="FrameReader")
+        self._thread.start()
+
+    def _run(self):
+        """读取线程主循环"""
+        try:
+            while not self._stop.is_set():
+                buffer = self._pool.acquire() if self._pool is not None else None
+                ret, frame = self._cap.read(buffer) if buffer is not None else self._cap.read()
+                if not ret:
+                    break
+                self._put(frame)
+        except Exception as e:
+            self._error = e
+        finally:
+            self._put(_EOF)
+
+    def _put(self, item):
+        """放入队列，关闭时放弃等待"""
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def read(self) -> Tuple[bool, Optional[np.ndarray]]:
+        """
+        读取下一帧
+
+        Returns:
+            (是否成功, 帧图像)，与 cv2.VideoCapture.read() 相同
+        """
+        if self._finished:
+            return False, None
+
+        item = self._queue.get()
+        if item is _EOF:
+            self._finished = True
+            if self._error is not None:
+                raise self._error
+            return False, None
+
+        return True, item
+
+    def close(self):
+        """停止读取线程"""
+        self._stop.set()
+        # 清空队列，唤醒可能阻塞在 put() 上的读取线程
+        while True:
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                break
+        self._thread.join()
+
+
+class ThreadedFrameWriter:
+    """
+    后台线程帧写入器
+    处理线程将帧放入有界队列，由独立线程调用底层写入器的 write() 完成编码，
+    接口与 cv2.VideoWriter.write() 一致
+    """
+
+    def __init__(self, writer, queue_size: int = 8, pool: Optional[FramePool] = None):
+        """
+        初始化帧写入器并启动写入线程
+
+        Args:
+            writer: 底层写入器（需提供 write(frame) 方法）
+            queue_size: 写入队列长度，队列满时处理线程阻塞（自动背压）
+            pool: 帧缓冲池，提供时编码完成的帧归还到池中
+        """
+        self._writer = writer
+        self._pool = pool
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._error: Optional[BaseException] = None
+        self._closed = False
+
+        self._thread = threading.Thread(target=self._run, daemon=True, name="FrameWriter")
+        self._thread.start()
+
+    def _run(self):
+        """写入线程主循环"""
+        while True:
+            frame = self._queue.get()
+            if frame is _EOF:
+                break
+            # 出错后继续消费队列，避免处理线程阻塞
+            if self._error is None:
+                try:
+                    self._writer.write(frame)
+                except Exception as e:
+                    self._error = e
+            # 底层写入器返回时已拷贝或编码完帧数据，帧可以复用
+            if self._pool is not None:
+                self._pool.release(frame)
+
+    def write(self, frame: np.ndarray):
+        """
+        写入一帧（帧对象交由写入线程使用，调用方之后不应再修改或访问）
+
+        Args:
+            frame: 待写入的帧
+        """
+        if self._error is not None:
+            raise self._error
+        self._queue.put(frame)
+
+    def close(self):
+        """
+        写完队列中剩余的帧并停止写入线程
+
+        写入线程出错时抛出该错误；若调用时已有异常正在传播（例如在 finally 中调用），
+        则不覆盖原异常，写入错误仅作为附注附加到原异常上
+        """
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_EOF)
+        self._thread.join()
+        if self._error is None:
+            return
+
+        propagating = sys.exc_info()[1]
+        if propagating is None:
+            raise self._error
+        if hasattr(propagating, 'add_note'):
+            propagating.add_note(f"写入线程同时出错: {self._error!r}")
+
+
+class FFmpegPipeWriter:
+    """
+    FFmpeg 管道写入器
+    将原始 BGR 帧通过 stdin 管道直接交给 FFmpeg 编码为 H.264，
+    省去 MPEG-4 临时文件及其二次解码和编码，接口与 cv2.VideoWriter 一致
+    """
+
+    # 首次检查进程状态时等待的时间（秒），用于发现启动即退出的编码进程
+    STARTUP_CHECK_SECONDS = 0.1
+
+    def __init__(
+        self,
+        output_path: str,
+        fps: float,
+        width: int,
+        height: int,
+        crf: int = 23,
+        preset: str = 'medium'
+    ):
+        """
+        初始化写入器并启动 FFmpeg 编码进程
+
+        Args:
+            output_path: 输出视频路径
+            fps: 帧率
+            width: 帧宽度
+            height: 帧高度
+            crf: H.264 质量参数
+            preset: x264 编码预设
+        """
+        self.output_path = output_path
+        self.error: Optional[str] = None
+        self._startup_checked = False
+
+        # stderr 写入临时文件，避免管道缓冲区写满导致 FFmpeg 阻塞
+        self._stderr = tempfile.TemporaryFile()
+
+        command = [
+            'ffmpeg',
+            '-y',
+            '-loglevel', 'error',
+            '-f', 'rawvideo',
+            '-vcodec', 'rawvideo',
+            '-pix_fmt', 'bgr24',
+            '-s', f'{width}x{height}',
+            '-r', str(fps),
+            '-i', '-',
+            '-c:v', 'libx264',
+            '-preset', preset,
+            '-crf', str(crf),
+            '-pix_fmt', 'yuv420p',
+            '-movflags', '+faststart',
+            output_path
+        ]
+
+        try:
+            self._process: Optional[subprocess.Popen] = subprocess.Popen(
+                command,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.DEVNULL,
+                stderr=self._stderr
+            )
+        except OSError as e:
+            self._process = None
+            self.error = str(e)
+
+    def isOpened(self) -> bool:
+        """编码进程是否正在运行（首次调用时短暂等待，参数错误等启动失败时返回 False 并记录 error）"""
+        if self._process is None:
+            return False
+
+        if not self._startup_checked:
+            self._startup_checked = True
+            try:
+                self._process.wait(timeout=self.STARTUP_CHECK_SECONDS)
+            except subprocess.TimeoutExpired:
+                pass
+
+        if self._process.poll() is not None:
+            self.error = self._read_stderr() or f"退出码 {self._process.returncode}"
+            return False
+        return True
+
+    def write(self, frame: np.ndarray):
+        """
+        写入一帧
+
+        Args:
+            frame: BGR 帧，尺寸需与初始化时一致
+        """
+        # 直接写入帧内存的视图，避免 tobytes() 额外拷贝一整帧（非连续数组才需拷贝）
+        if not frame.flags.c_contiguous:
+            frame = np.ascontiguousarray(frame)
+        try:
+            self._process.stdin.write(frame.data.cast('B'))
+        except (BrokenPipeError, OSError) as exc:
+            raise RuntimeError(f"FFmpeg 编码进程异常退出: {self._read_stderr()}") from exc
+
+    def release(self):
+        """关闭管道并等待 FFmpeg 完成剩余帧的编码，失败信息记录在 error 属性中"""
+        if self._process is None:
+            return
+
+        try:
+            self._process.stdin.close()
+        except (BrokenPipeError, OSError):
+            pass
+
+        if self._process.wait() != 0:
+            self.error = self._read_stderr() or f"退出码 {self._process.returncode}"
+
+        self._process = None
+        self._stderr.close()
+
+    def _read_stderr(self) -> str:
+        """读取 FFmpeg 错误输出"""
+        self._stderr.seek(0)
+        return self._stderr.read().decode('utf-8', errors='replace').strip()
+
+
+class CudaVideoReader:
+    """
+    NVDEC 硬件解码读取器
+    使用 cv2.cudacodec 在 GPU 上解码视频，将 CPU 留给 OCR 预处理，
+    接口与 cv2.VideoCapture 的 read/grab/retrieve/set/release 一致
+    """
+
+    def __init__(self, input_path: str, gpu_id: int = 0):
+        """
+        初始化硬件解码读取器
+
+        Args:
+            input_path: 输入视频路径
+            gpu_id: GPU 设备编号
+        """
+        cv2.cuda.setDevice(gpu_id)
+        self._input_path = input_path
+        self._reader = cv2.cudacodec.createVideoReader(input_path)
+        self._gpu_frame = None
+
+    @staticmethod
+    def is_available() -> bool:
+        """当前 OpenCV 是否带有 cudacodec 模块且存在可用的 CUDA 设备"""
+        if not hasattr(cv2, 'cudacodec') or not hasattr(cv2, 'cuda'):
+            return False
+        try:
+            return cv2.cuda.getCudaEnabledDeviceCount() > 0
+        except cv2.error:
+            return False
+
+    def isOpened(self) -> bool:
+        """读取器是否可用"""
+        return self._reader is not None
+
+    def grab(self) -> bool:
+        """解码下一帧但不下载到内存"""
+        ret, self._gpu_frame = self._reader.nextFrame()
+        if not ret:
+            self._gpu_frame = None
+        return ret
+
+    def retrieve(self) -> Tuple[bool, Optional[np.ndarray]]:
+        """
+        下载最近一次 grab() 解码的帧
+
+        Returns:
+            (是否成功, BGR 帧图像)
+        """
+        if self._gpu_frame is None:
+            return False, None
+
+        frame = self._gpu_frame.download()
+        # cudacodec 默认输出 BGRA
+        if frame.ndim == 3 and frame.shape[2] == 4:
+            frame = cv2.cvtColor(frame, cv2.COLOR_BGRA2BGR)
+        return True, frame
+
+    def read(self, image: Optional[np.ndarray] = None) -> Tuple[bool, Optional[np.ndarray]]:
+        """
+        读取下一帧
+
+        Args:
+            image: 与 cv2.VideoCapture.read() 保持兼容的输出缓冲区（未使用，每帧从显存下载到新数组）
+
+        Returns:
+            (是否成功, BGR 帧图像)，与 cv2.VideoCapture.read() 相同
+        """
+        if not self.grab():
+            return False, None
+        return self.retrieve()
+
+    def set(self, prop_id: int, value: float) -> bool:
+        """
+        设置属性，仅支持回到开头（CAP_PROP_POS_FRAMES = 0），通过重建解码器实现
+
+        Args:
+            prop_id: 属性编号
+            value: 属性值
+
+        Returns:
+            是否设置成功
+        """
+        if prop_id != cv2.CAP_PROP_POS_FRAMES or value != 0:
+            return False
+        self._reader = cv2.cudacodec.createVideoReader(self._input_path)
+        self._gpu_frame = None
+        return True
+
+    def release(self):
+        """释放解码器"""
+        self._reader = None
+        self._gpu_frame = None
@@ -3,12 +3,16 @@
 支持逐帧模式和智能采样模式，自动检测并打码视频中的目标内容
 """
 import cv2
+import heapq
 import numpy as np
 import time
 import subprocess
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, Dict, Any, List, Tuple
 from pathlib import Path
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 from privision.config.args import ProcessConfig
 from privision.ui.progress import ProgressCallback
@@ -16,7 +20,35 @@ from privision.ui.visualizer import Visualizer
 from privision.core.ocr_detector import OCRDetector
 from privision.core.detector_factory import DetectorFactory
 from privision.core.precise_locator import PreciseLocator
-from privision.core.blur import apply_blur
+from privision.core.blur import CudaGaussianBlur, apply_blur_regions, apply_blur_rects
+from privision.core.video_io import (
+    FramePool, ThreadedFrameReader, ThreadedFrameWriter, FFmpegPipeWriter, CudaVideoReader
+)
+
+
+# 多区域打码共享线程池（首次使用时创建）
+_blur_pool: Optional[ThreadPoolExecutor] = None
+_blur_pool_lock = threading.Lock()
+
+
+def _get_blur_pool() -> Optional[ThreadPoolExecutor]:
+    """
+    获取多区域打码共享线程池
+
+    线程池大小与 OpenCV 线程数一致，单线程环境下不启用；
+    API 服务为每个任务创建一个处理器，共用线程池使线程数不随任务数增长
+
+    Returns:
+        线程池，单线程环境下返回 None
+    """
+    global _blur_pool
+    num_threads = cv2.getNumThreads()
+    if num_threads <= 1:
+        return None
+    with _blur_pool_lock:
+        if _blur_pool is None:
+            _blur_pool = ThreadPoolExecutor(max_workers=num_threads, thread_name_prefix="BlurWorker")
+        return _blur_pool
 
 
 @dataclass
@@ -27,6 +59,268 @@ class DetectionRegion:
     confidence: float     # 置信度
     start_frame: int      # 起始帧号
     end_frame: int        # 结束帧号
+    rect: Tuple[int, int, int, int] = field(init=False, repr=False)  # 外接矩形，创建时计算一次
+
+    def __post_init__(self):
+        self.rect = OCRDetector.get_bbox_rect(self.bbox)
+
+
+def _rect_iou(a: Tuple[int, int, int, int], b: Tuple[int, int, int, int]) -> float:
+    """
+    计算两个轴对齐矩形的交并比
+
+    Args:
+        a: (x_min, y_min, x_max, y_max)
+        b: (x_min, y_min, x_max, y_max)
+
+    Returns:
+        交并比 (0-1)
+    """
+    inter_w = min(a[2], b[2]) - max(a[0], b[0])
+    inter_h = min(a[3], b[3]) - max(a[1], b[1])
+    if inter_w <= 0 or inter_h <= 0:
+        return 0.0
+    inter = inter_w * inter_h
+    union = (a[2] - a[0]) * (a[3] - a[1]) + (b[2] - b[0]) * (b[3] - b[1]) - inter
+    return inter / union if union > 0 else 0.0
+
+
+class ActiveRegionTracker:
+    """
+    按帧号递增查询当前生效的检测区域
+
+    未开始的区域按起始帧放入最小堆，生效中的区域按结束帧放入最小堆，
+    每帧只处理新开始和刚结束的区域，代替对全部区域的线性扫描。
+    生效区域的外接矩形单独缓存为一列，只在生效区域变化时重建，打码时无需每帧逐个读取区域属性。
+    可选地将时间段相接、位置基本相同的区域合并为一个，减少每帧的打码次数
+    """
+
+    def __init__(self, regions: Optional[List[DetectionRegion]] = None, merge_iou: float = 0.0):
+        """
+        初始化区域跟踪器
+
+        Args:
+            regions: 初始检测区域列表
+            merge_iou: 合并阈值，新区域与时间段重叠或相接、外接矩形交并比超过该值的已有区域合并（0表示不合并）
+        """
+        self._upcoming: List[Tuple[int, int, DetectionRegion]] = []  # (起始帧, 序号, 区域)
+        self._active: List[Tuple[int, int, DetectionRegion]] = []  # (结束帧, 序号, 区域)
+        self._current: List[DetectionRegion] = []
+        self._current_rects: List[Tuple[int, int, int, int]] = []
+        self._dirty = False  # 合并修改了已有区域，需要重建缓存
+        # 合并候选窗口：按结束帧排列的未结束区域，新区域开始前已结束的区域移出窗口
+        self._merge_window: List[Tuple[int, int, DetectionRegion]] = []  # (结束帧, 序号, 区域)
+        self._last_frame = -1  # 最近一次 active_at() 查询的帧号
+        # 合并前的原始区域按 (起始帧, 结束帧) 和结束帧单独维护，用于统计每帧生效的原始检测数
+        self._source_upcoming: List[Tuple[int, int]] = []
+        self._source_active: List[int] = []
+        self._seq = 0
+        self._merge_iou = merge_iou
+        if regions:
+            self.add(regions)
+
+    def add(self, regions: List[DetectionRegion]):
+        """
+        添加检测区域（起始帧不应早于已查询过的帧）
+
+        Args:
+            regions: 检测区域列表
+        """
+        for region in regions:
+            heapq.heappush(self._source_upcoming, (region.start_frame, region.end_frame))
+            if self._merge_iou > 0:
+                if self._merge(region):
+                    continue
+                heapq.heappush(self._merge_window, (region.end_frame, self._seq, region))
+            heapq.heappush(self._upcoming, (region.start_frame, self._seq, region))
+            self._seq += 1
+
+    def _merge(self, region: DetectionRegion) -> bool:
+        """
+        尝试将区域合并到已有的未结束区域中
+
+        合并后的区域取两者外接矩形的并集，结束帧取较晚者；
+        只合并起始帧不早于已有区域的新区域，保证已有区域在堆中的起始帧仍然有效。
+        区域按起始帧递增添加时，在新区域开始前已结束的区域不可能再被合并，直接移出候选窗口，
+        每次只需检查时间上与新区域重叠或相接的区域
+
+        Args:
+            region: 新检测区域
+
+        Returns:
+            是否已合并
+        """
+        window = self._merge_window
+        # 结束帧早于该值的区域与新区域不相接，或已在查询中移出生效列表
+        min_end = max(region.start_frame - 1, self._last_frame)
+        while window and window[0][0] < min_end:
+            _, seq, existing = heapq.heappop(window)
+            if existing.end_frame >= min_end:
+                # 合并后结束帧延后的区域按新的结束帧重新入堆
+                heapq.heappush(window, (existing.end_frame, seq, existing))
+
+        rect = region.rect
+        for _, _, existing in window:
+            if (
+                existing.start_frame <= region.start_frame <= existing.end_frame + 1
+                and _rect_iou(rect, existing.rect) > self._merge_iou
+            ):
+                x_min, y_min, x_max, y_max = existing.rect
+                x_min, y_min = min(x_min, rect[0]), min(y_min, rect[1])
+                x_max, y_max = max(x_max, rect[2]), max(y_max, rect[3])
+                existing.bbox = np.array(
+                    [[x_min, y_min], [x_max, y_min], [x_max, y_max], [x_min, y_max]],
+                    dtype=existing.bbox.dtype
+                )
+                existing.rect = (x_min, y_min, x_max, y_max)
+                self._dirty = True
+                existing.end_frame = max(existing.end_frame, region.end_frame)
+                return True
+        return False
+
+    def active_at(self, frame_idx: int) -> List[DetectionRegion]:
+        """
+        获取在指定帧生效的区域（帧号需单调递增）
+
+        Args:
+            frame_idx: 帧索引
+
+        Returns:
+            生效区域列表，按添加顺序排列（调用方不应修改）
+        """
+        upcoming = self._upcoming
+        active = self._active
+        changed = False
+        self._last_frame = frame_idx
+
+        # 加入已开始的区域
+        while upcoming and upcoming[0][0] <= frame_idx:
+            _, seq, region = heapq.heappop(upcoming)
+            if region.end_frame >= frame_idx:
+                heapq.heappush(active, (region.end_frame, seq, region))
+                changed = True
+
+        # 移除已结束的区域（合并后结束帧延后的区域按新的结束帧重新入堆）
+        while active and active[0][0] < frame_idx:
+            _, seq, region = heapq.heappop(active)
+            if region.end_frame >= frame_idx:
+                heapq.heappush(active, (region.end_frame, seq, region))
+            else:
+                changed = True
+
+        # 原始区域计数
+        source_upcoming = self._source_upcoming
+        source_active = self._source_active
+        while source_upcoming and source_upcoming[0][0] <= frame_idx:
+            _, end_frame = heapq.heappop(source_upcoming)
+            if end_frame >= frame_idx:
+                heapq.heappush(source_active, end_frame)
+        while source_active and source_active[0] < frame_idx:
+            heapq.heappop(source_active)
+
+        # 生效区域变化时才重建列表，按添加顺序排列保证重叠区域的打码顺序不变
+        if changed or self._dirty:
+            self._current = [region for _, _, region in sorted(active, key=lambda item: item[1])]
+            self._current_rects = [region.rect for region in self._current]
+            self._dirty = False
+
+        return self._current
+
+    @property
+    def active_count(self) -> int:
+        """最近一次 active_at() 查询的帧上生效的原始检测区域数（合并前），用于统计检测总数"""
+        return len(self._source_active)
+
+    @property
+    def current_rects(self) -> List[Tuple[int, int, int, int]]:
+        """最近一次 active_at() 返回的区域对应的外接矩形（调用方不应修改）"""
+        return self._current_rects
+
+
+class SampleOCRCache:
+    """
+    采样帧OCR结果缓存
+
+    以缩小到 8x8 的灰度图生成 64 位均值哈希作为键，哈希相同的帧直接复用识别结果；
+    与上一次识别的帧汉明距离不超过阈值时视为同一画面，复用其结果
+    """
+
+    def __init__(self, max_distance: int = 2):
+        """
+        初始化缓存
+
+        Args:
+            max_distance: 视为同一画面的最大汉明距离
+        """
+        self._results: Dict[int, Optional[List]] = {}
+        self._last_key: Optional[int] = None
+        self._max_distance = max_distance
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def average_hash(frame: np.ndarray) -> int:
+        """
+        计算帧的 64 位均值哈希
+
+        Args:
+            frame: BGR 帧
+
+        Returns:
+            哈希值
+        """
+        small = cv2.resize(frame, (8, 8), interpolation=cv2.INTER_AREA)
+        if small.ndim == 3:
+            small = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+        return int.from_bytes(np.packbits(small > small.mean()).tobytes(), 'big')
+
+    def lookup(self, frame: np.ndarray) -> Tuple[int, bool]:
+        """
+        查找帧对应的缓存键，未命中时为其预留条目（识别后通过 store() 填入结果）
+
+        Args:
+            frame: BGR 帧
+
+        Returns:
+            (缓存键, 是否命中)
+        """
+        key = self.average_hash(frame)
+        hit = key in self._results
+        if not hit and self._last_key is not None:
+            if bin(key ^ self._last_key).count('1') <= self._max_distance:
+                key = self._last_key
+                hit = True
+
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+            self._results[key] = None
+
+        self._last_key = key
+        return key, hit
+
+    def store(self, key: int, detections: List):
+        """
+        写入识别结果
+
+        Args:
+            key: lookup() 返回的缓存键
+            detections: OCR检测结果
+        """
+        self._results[key] = detections
+
+    def get(self, key: int) -> List:
+        """
+        读取识别结果
+
+        Args:
+            key: lookup() 返回的缓存键
+
+        Returns:
+            OCR检测结果
+        """
+        return self._results[key]
 
 
 class VideoProcessor:
@@ -37,6 +331,9 @@ class VideoProcessor:
     2. smart: 智能采样，定期采样检测，区域应用到时间段
     """
 
+    # 智能模式中合并相邻检测区域的交并比阈值
+    REGION_MERGE_IOU = 0.6
+
     def __init__(
         self,
         config: ProcessConfig,
@@ -53,7 +350,7 @@ class VideoProcessor:
         self.progress_callback = progress_callback
 
         # 初始化OCR检测器
-        self.ocr_detector = OCRDetector(device=config.device)
+        self.ocr_detector = OCRDetector(device=config.device, precision=config.ocr_precision)
 
         # 初始化模式检测器
         detector_kwargs = getattr(config, 'detector_kwargs', {})
@@ -81,6 +378,22 @@ class VideoProcessor:
             )
             self._log_visualizer_info()
 
+        # OCR结果的文本预筛：不可能包含目标的文本在解析时直接丢弃；
+        # 可视化需要显示所有识别到的文本，此时不预筛
+        self._text_filter = None if self.visualizer else self.detector.may_contain_pattern
+
+        # 多区域打码线程池：进程内所有处理器共用一个，避免每个任务各自创建线程
+        self._blur_pool = _get_blur_pool()
+
+        # 使用GPU时高斯模糊也在GPU上执行（OpenCV 不带 CUDA 模块时使用CPU）
+        self._gpu_blur: Optional[CudaGaussianBlur] = None
+        if config.device_type == 'gpu' and CudaGaussianBlur.is_available():
+            self._gpu_blur = CudaGaussianBlur(config.gpu_id)
+            self._log("  ✓ 高斯模糊使用 CUDA 加速", 'success')
+
+        # 智能模式采样帧OCR缓存（每次处理时重建）
+        self._sample_cache: Optional[SampleOCRCache] = None
+
     def _log_visualizer_info(self):
         """输出可视化模式信息"""
         self._log("\n=== 可视化模式已启用 ===")
@@ -119,52 +432,91 @@ class VideoProcessor:
         except (subprocess.CalledProcessError, FileNotFoundError):
             return False
 
-    def _reencode_with_ffmpeg(self, temp_path: str, output_path: str):
+    def _finish_ffmpeg(self, out: FFmpegPipeWriter):
         """
-        使用 FFmpeg 重新编码视频以获得更好的 H.264 压缩
+        关闭 FFmpeg 管道并等待编码完成
 
         Args:
-            temp_path: 临时视频文件路径
-            output_path: 最终输出路径
+            out: FFmpeg 管道写入器
         """
-        self._log("\n使用 FFmpeg 进行 H.264 编码...", 'info')
+        self._log("\n等待 FFmpeg 完成 H.264 编码...", 'info')
 
         # 通知开始压缩（进度0%）
         if self.progress_callback:
             self.progress_callback.on_phase_change("compression", 3, 3)
             self.progress_callback.on_progress(0, 100, phase='compress')
 
-        try:
-            subprocess.run(
-                [
-                    'ffmpeg',
-                    '-i', temp_path,
-                    '-c:v', 'libx264',
-                    '-preset', 'medium',
-                    '-crf', '23',
-                    '-pix_fmt', 'yuv420p',
-                    '-movflags', '+faststart',
-                    '-y',
-                    output_path
-                ],
-                check=True,
-                capture_output=True,
-                text=True
-            )
+        out.release()
 
-            # 删除临时文件
-            Path(temp_path).unlink()
-            self._log("  ✓ H.264 编码完成", 'success')
+        if out.error:
+            self._log(f"  ✗ FFmpeg 编码失败: {out.error}", 'error')
+            raise RuntimeError(f"FFmpeg 编码失败: {out.error}")
 
-            # 通知压缩完成（进度100%）
-            if self.progress_callback:
-                self.progress_callback.on_progress(100, 100, phase='compress')
+        self._log("  ✓ H.264 编码完成", 'success')
+
+        # 通知压缩完成（进度100%）
+        if self.progress_callback:
+            self.progress_callback.on_progress(100, 100, phase='compress')
+
+    def _open_gpu_reader(self, cap: cv2.VideoCapture, input_path: str):
+        """
+        尝试使用硬件解码器替换 CPU 解码，不可用时保留原捕获对象
+
+        优先使用 NVDEC（cudacodec），其次使用 FFmpeg 后端的硬件加速解码
+
+        Args:
+            cap: 已打开的 CPU 视频捕获对象
+            input_path: 输入视频路径
+
+        Returns:
+            视频读取器（CudaVideoReader、硬件加速的 cv2.VideoCapture 或原 cap）
+        """
+        if CudaVideoReader.is_available():
+            try:
+                reader = CudaVideoReader(input_path, self.config.gpu_id)
+            except cv2.error as e:
+                self._log(f"  NVDEC 硬件解码初始化失败: {e}", 'warning')
+            else:
+                cap.release()
+                self._log("  ✓ 使用 NVDEC 硬件解码", 'success')
+                return reader
+        else:
+            self._log("  当前 OpenCV 不支持 cudacodec", 'warning')
+
+        hw_cap = self._open_hw_capture(input_path)
+        if hw_cap is None:
+            self._log("  硬件加速解码不可用，使用 CPU 解码", 'warning')
+            return cap
 
-        except subprocess.CalledProcessError as e:
-            self._log(f"  ✗ FFmpeg 编码失败: {e.stderr}", 'error')
-            self._log("  保留临时文件作为输出", 'warning')
-            # 如果 FFmpeg 失败，使用临时文件作为输出
-            Path(temp_path).rename(output_path)
+        cap.release()
+        self._log("  ✓ 使用 FFmpeg 硬件加速解码", 'success')
+        return hw_cap
+
+    @staticmethod
+    def _open_hw_capture(input_path: str) -> Optional[cv2.VideoCapture]:
+        """
+        通过 FFmpeg 后端打开启用硬件加速解码的视频捕获对象
+
+        Args:
+            input_path: 输入视频路径
+
+        Returns:
+            实际启用了硬件加速的视频捕获对象，否则返回 None
+        """
+        if not hasattr(cv2, 'CAP_PROP_HW_ACCELERATION'):
+            return None
+
+        hw_cap = cv2.VideoCapture(
+            input_path,
+            cv2.CAP_FFMPEG,
+            [cv2.CAP_PROP_HW_ACCELERATION, cv2.VIDEO_ACCELERATION_ANY]
+        )
+        # 没有可用的硬件解码器时 FFmpeg 后端会静默回退到软件解码
+        if hw_cap.isOpened() and hw_cap.get(cv2.CAP_PROP_HW_ACCELERATION) != cv2.VIDEO_ACCELERATION_NONE:
+            return hw_cap
+
+        hw_cap.release()
+        return None
 
     def process_video(
         self,
@@ -212,43 +564,47 @@ class VideoProcessor:
         has_ffmpeg = self._has_ffmpeg()
         self._log_ffmpeg_status(has_ffmpeg)
 
+        # GPU 模式下尝试切换为硬件解码
+        if self.config.device_type == 'gpu':
+            cap = self._open_gpu_reader(cap, input_path)
+
         # 创建输出目录
         Path(output_path).parent.mkdir(parents=True, exist_ok=True)
 
-        # 决定输出文件名
+        # 创建视频写入器：有 FFmpeg 时通过管道直接编码为 H.264，否则使用 OpenCV 的 MPEG-4 编码
         if has_ffmpeg:
-            temp_output = str(Path(output_path).with_suffix('.temp.mp4'))
-            final_output = output_path
+            out = FFmpegPipeWriter(output_path, fps, width, height)
         else:
-            temp_output = output_path
-            final_output = None
-
-        # 创建视频写入器
-        fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-        out = cv2.VideoWriter(temp_output, fourcc, fps, (width, height))
+            fourcc = cv2.VideoWriter_fourcc(*'mp4v')
+            out = cv2.VideoWriter(output_path, fourcc, fps, (width, height))
 
         if not out.isOpened():
             cap.release()
-            raise ValueError(f"无法创建输出视频文件: {temp_output}")
+            error = getattr(out, 'error', None)
+            raise ValueError(f"无法创建输出视频文件: {output_path}" + (f" ({error})" if error else ""))
 
         # 根据模式选择处理方法
         try:
             if self.config.mode == 'smart':
-                stats = self._process_smart(cap, out, fps, total_frames)
+                stats = self._process_smart(cap, out, fps, total_frames, width * height * 3)
             else:
                 stats = self._process_frame_by_frame(cap, out, total_frames, fps)
+        except BaseException:
+            out.release()
+            raise
         finally:
             # 释放资源
             cap.release()
-            out.release()
 
             # 关闭可视化窗口
             if self.visualizer:
                 self.visualizer.close()
 
-        # 使用 FFmpeg 重新编码（如果可用）
-        if has_ffmpeg and final_output:
-            self._reencode_with_ffmpeg(temp_output, final_output)
+        # 完成编码
+        if has_ffmpeg:
+            self._finish_ffmpeg(out)
+        else:
+            out.release()
 
         # 添加输出路径到统计信息
         stats['output_path'] = output_path
@@ -267,8 +623,8 @@ class VideoProcessor:
         self._log("\n编码配置:")
         if has_ffmpeg:
             self._log("  ✓ 检测到 FFmpeg，将使用 H.264 高效编码", 'success')
-            self._log("  临时编码: MPEG-4")
-            self._log("  最终编码: H.264 (CRF 23, Preset Medium)")
+            self._log("  编码方式: 原始帧通过管道直接送入 FFmpeg")
+            self._log("  输出编码: H.264 (CRF 23, Preset Medium)")
         else:
             self._log("  ✗ 未检测到 FFmpeg，使用 MPEG-4 编码", 'warning')
             self._log("  提示: 安装 FFmpeg 可获得更好的压缩率", 'warning')
@@ -283,6 +639,9 @@ class VideoProcessor:
             saved_calls = stats['total_frames'] - stats['ocr_calls']
             self._log(f"  OCR 调用次数: {stats['ocr_calls']} (节省 {saved_calls} 次)")
 
+        if 'ocr_cache_hits' in stats:
+            self._log(f"  OCR 缓存: 命中 {stats['ocr_cache_hits']} 次, 未命中 {stats['ocr_cache_misses']} 次")
+
         self._log(f"  包含目标的帧数: {stats.get('frames_with_detections', 0)}")
         self._log(f"  检测到的目标总数: {stats.get('total_detections', 0)}")
 
@@ -319,66 +678,166 @@ class VideoProcessor:
         else:
             self._log(f"精确定位: 未启用")
 
-        # 统计信息
+        diff_threshold = self.config.frame_diff_threshold
+        if diff_threshold > 0:
+            self._log(f"相似帧复用: 已启用 (差异阈值: {diff_threshold}, 每 {fps} 帧强制重新识别)")
+
+        presence_threshold = self.config.text_presence_threshold
+        if presence_threshold > 0:
+            self._log(f"文本预筛: 已启用 (边缘像素占比阈值: {presence_threshold})")
+
+        # 识别与打码在同一遍中完成
+        if self.progress_callback:
+            self.progress_callback.on_phase_change("processing", 1, 1)
+
+        # 统计信息（循环内使用局部计数器，结束后统一写回）
         stats = {
             'total_frames': total_frames,
             'processed_frames': 0,
+            'ocr_calls': 0,
             'frames_with_detections': 0,
             'total_detections': 0
         }
+        processed_frames = 0
+        ocr_calls = 0
+        frames_with_detections = 0
+        total_detections = 0
+
+        # 相似帧复用状态：最近一次OCR帧的签名及其检测结果
+        key_signature = None
+        key_detections = []
+        reused_frames = 0
+        max_reused_frames = max(1, fps)
+
+        # 解码、检测、编码三阶段流水线：解码和编码在后台线程中进行，
+        # OCR检测器只在当前线程中使用
+        batch_size = self.config.ocr_batch_size
+        pool = FramePool()
+        reader = ThreadedFrameReader(cap, queue_size=batch_size, pool=pool)
+        writer = ThreadedFrameWriter(out, queue_size=batch_size, pool=pool)
+
+        # 预先绑定循环内使用的方法，减少每帧的属性查找
+        read_frame = reader.read
+        write_frame = writer.write
+        detect_batch = self._detect_text_batch
+        process_frame = self._process_single_frame
+        progress_callback = self.progress_callback
+
+        # 进度汇报间隔：回调每 0.5% 更新一次（UI 刷新和任务状态保存开销较大），
+        # 控制台每 32 帧输出一次；使用倒数计数，避免每帧取模和比较
+        report_interval = max(1, total_frames // 200) if progress_callback else 32
+        report_countdown = report_interval
 
         frame_idx = 0
-        start_time = time.time()
-        last_fps_update = start_time
+        start_time = time.monotonic()
         current_fps = 0.0
 
         try:
             while True:
-                ret, frame = cap.read()
-                if not ret:
+                # 预读一批帧，通过一次OCR调用完成整批检测
+                frames = []
+                while len(frames) < batch_size:
+                    ret, frame = read_frame()
+                    if not ret:
+                        break
+                    frames.append(frame)
+
+                if not frames:
                     break
 
-                frame_idx += 1
-
-                # 计算当前处理速度
-                current_time = time.time()
-                if current_time - last_fps_update >= 1.0:
-                    elapsed = current_time - start_time
-                    current_fps = frame_idx / elapsed if elapsed > 0 else 0
-                    last_fps_update = current_time
-
-                # 处理当前帧
-                processed_frame, detection_count = self._process_single_frame(
-                    frame,
-                    frame_idx,
-                    total_frames,
-                    current_fps
-                )
-
-                # 写入输出视频
-                out.write(processed_frame)
+                # 挑选需要OCR的关键帧，与最近关键帧近似相同的帧复用其检测结果
+                ocr_frames = []
+                sources = []  # 每帧对应的关键帧在 ocr_frames 中的下标，-1 表示沿用上一批的关键帧，None 表示无文本
+                for frame in frames:
+                    # 边缘过少的帧不可能包含文字，直接跳过OCR
+                    if presence_threshold > 0 and self._edge_density(frame) < presence_threshold:
+                        sources.append(None)
+                        continue
+                    if diff_threshold > 0:
+                        signature = self._frame_signature(frame)
+                        if (
+                            key_signature is not None
+                            and reused_frames < max_reused_frames
+                            and np.abs(signature - key_signature).mean() < diff_threshold
+                        ):
+                            reused_frames += 1
+                            sources.append(len(ocr_frames) - 1)
+                            continue
+                        key_signature = signature
+                        reused_frames = 0
+                    sources.append(len(ocr_frames))
+                    ocr_frames.append(frame)
+
+                batch_detections = detect_batch(ocr_frames) if ocr_frames else []
+                ocr_calls += len(ocr_frames)
+                if progress_callback:
+                    for _ in ocr_frames:
+                        progress_callback.on_ocr_call()
+
+                for frame, source in zip(frames, sources):
+                    if source is None:
+                        detections = []
+                    else:
+                        detections = batch_detections[source] if source >= 0 else key_detections
+                    frame_idx += 1
 
-                # 更新统计
-                stats['processed_frames'] += 1
-                if detection_count > 0:
-                    stats['frames_with_detections'] += 1
-                    stats['total_detections'] += detection_count
+                    # 每 32 帧采样一次时钟更新处理速度，避免每帧调用计时函数
+                    if not frame_idx & 0x1F:
+                        elapsed = time.monotonic() - start_time
+                        current_fps = frame_idx / elapsed if elapsed > 0 else 0
 
-                # 进度回调
-                if self.progress_callback:
-                    self.progress_callback.on_progress(
+                    # 处理当前帧
+                    processed_frame, detection_count = process_frame(
+                        frame,
                         frame_idx,
                         total_frames,
-                        phase='processing'
+                        current_fps,
+                        detections=detections
                     )
-                elif frame_idx % 30 == 0:
-                    progress = (frame_idx / total_frames) * 100
-                    self._log(f"  处理进度: {frame_idx}/{total_frames} ({progress:.1f}%)")
+
+                    # 写入输出视频
+                    write_frame(processed_frame)
+
+                    # 更新统计
+                    processed_frames += 1
+                    if detection_count > 0:
+                        frames_with_detections += 1
+                        total_detections += detection_count
+
+                    # 更新进度
+                    report_countdown -= 1
+                    if not report_countdown or frame_idx == total_frames:
+                        report_countdown = report_interval
+                        if progress_callback:
+                            progress_callback.on_progress(
+                                frame_idx,
+                                total_frames,
+                                phase='processing'
+                            )
+                        else:
+                            progress = (frame_idx / total_frames) * 100
+                            self._log(f"  处理进度: {frame_idx}/{total_frames} ({progress:.1f}%)")
+
+                if batch_detections:
+                    key_detections = batch_detections[-1]
+
+                # 读到视频末尾
+                if len(frames) < batch_size:
+                    break
 
         except KeyboardInterrupt:
             self._log("\n用户中断处理", 'warning')
             raise
 
+        finally:
+            reader.close()
+            writer.close()
+
+        stats['processed_frames'] = processed_frames
+        stats['ocr_calls'] = ocr_calls
+        stats['frames_with_detections'] = frames_with_detections
+        stats['total_detections'] = total_detections
+
         return stats
 
     def _process_smart(
@@ -386,16 +845,21 @@ class VideoProcessor:
         cap: cv2.VideoCapture,
         out: cv2.VideoWriter,
         fps: int,
-        total_frames: int
+        total_frames: int,
+        frame_bytes: int
     ) -> Dict[str, Any]:
         """
         智能采样模式 - 定期采样检测，区域应用到时间段
 
+        预读缓冲所需内存不超过 single_pass_max_buffer_mb 时，识别与打码在一次解码中完成；
+        否则回退为先采样识别、再重新解码打码的两遍处理
+
         Args:
             cap: 视频捕获对象
             out: 视频写入器
             fps: 视频帧率
             total_frames: 总帧数
+            frame_bytes: 单帧字节数
 
         Returns:
             处理统计信息
@@ -417,6 +881,13 @@ class VideoProcessor:
         else:
             self._log(f"  精确定位: 未启用")
 
+        if self.config.text_presence_threshold > 0:
+            self._log(f"  文本预筛: 已启用 (边缘像素占比阈值: {self.config.text_presence_threshold})")
+
+        self._sample_cache = SampleOCRCache() if self.config.sample_hash_cache else None
+        if self._sample_cache:
+            self._log(f"  OCR 缓存: 已启用 (感知哈希)")
+
         # 统计信息
         stats = {
             'total_frames': total_frames,
@@ -427,131 +898,330 @@ class VideoProcessor:
             'unique_detections': set()
         }
 
+        # 单遍处理需要缓存的帧数：一帧要等到可能覆盖它的采样帧（最远在 buffer_frames 之后）
+        # 完成识别后才能输出，至少需要 buffer_frames + sample_frame_interval 帧；
+        # 在此基础上最多再多缓存一批采样帧，以便批量OCR
+        min_pending = buffer_frames + sample_frame_interval + 1
+        max_buffer_bytes = self.config.single_pass_max_buffer_mb * 1024 * 1024
+        max_pending = min(
+            max_buffer_bytes // max(1, frame_bytes),
+            min_pending + self.config.ocr_batch_size * sample_frame_interval
+        )
+
         try:
-            # 阶段1: 识别阶段 - 记录所有需要打码的区域
-            self._log("\n[阶段 1/2] 识别目标区域...")
-            if self.progress_callback:
-                self.progress_callback.on_phase_change("detection", 1, 2)
+            if max_pending >= min_pending:
+                buffer_mb = max_pending * frame_bytes / (1024 * 1024)
+                self._log(f"  处理方式: 单遍 (识别与打码同时进行，最多缓存 {max_pending} 帧，约 {buffer_mb:.1f} MB)")
+                if self.progress_callback:
+                    self.progress_callback.on_phase_change("processing", 1, 1)
+                self._single_pass_smart(
+                    cap, out, fps, total_frames, sample_frame_interval,
+                    buffer_frames, max_pending, stats
+                )
+            else:
+                if self.config.single_pass_max_buffer_mb == 0:
+                    self._log(f"  处理方式: 两遍 (单遍处理已禁用)")
+                else:
+                    min_mb = min_pending * frame_bytes / (1024 * 1024)
+                    self._log(f"  处理方式: 两遍 (单遍处理至少需缓存 {min_pending} 帧，约 {min_mb:.1f} MB，"
+                              f"超出上限 {self.config.single_pass_max_buffer_mb} MB)")
+
+                # 阶段1: 识别阶段 - 记录所有需要打码的区域
+                self._log("\n[阶段 1/2] 识别目标区域...")
+                if self.progress_callback:
+                    self.progress_callback.on_phase_change("detection", 1, 2)
 
-            detection_regions = self._sampling_phase(
-                cap, fps, total_frames, sample_frame_interval,
-                buffer_frames, stats
-            )
+                detection_regions = self._sampling_phase(
+                    cap, fps, total_frames, sample_frame_interval,
+                    buffer_frames, stats
+                )
 
-            self._log(f"\n识别完成: 共 {stats['ocr_calls']} 次 OCR 调用, "
-                     f"发现 {len(detection_regions)} 个检测区域", 'success')
+                self._log(f"\n识别完成: 共 {stats['ocr_calls']} 次 OCR 调用, "
+                         f"发现 {len(detection_regions)} 个检测区域", 'success')
 
-            # 阶段2: 打码阶段 - 逐帧处理并应用打码
-            self._log("\n[阶段 2/2] 应用打码效果...")
-            if self.progress_callback:
-                self.progress_callback.on_phase_change("masking", 2, 2)
+                # 阶段2: 打码阶段 - 逐帧处理并应用打码
+                self._log("\n[阶段 2/2] 应用打码效果...")
+                if self.progress_callback:
+                    self.progress_callback.on_phase_change("masking", 2, 2)
 
-            self._blurring_phase(
-                cap, out, fps, total_frames, detection_regions, stats
-            )
+                self._blurring_phase(
+                    cap, out, fps, total_frames, detection_regions, stats
+                )
 
         except KeyboardInterrupt:
             self._log("\n用户中断处理", 'warning')
             raise
 
+        if self._sample_cache:
+            stats['ocr_cache_hits'] = self._sample_cache.hits
+            stats['ocr_cache_misses'] = self._sample_cache.misses
+
         # 转换unique_detections为列表
         stats['unique_detections'] = list(stats['unique_detections'])
 
         return stats
 
-    def _sampling_phase(
+    def _single_pass_smart(
         self,
         cap: cv2.VideoCapture,
+        out: cv2.VideoWriter,
         fps: int,
         total_frames: int,
         sample_frame_interval: int,
         buffer_frames: int,
+        max_pending: int,
         stats: Dict[str, Any]
-    ) -> List[DetectionRegion]:
+    ):
         """
-        采样识别阶段
+        单遍智能处理：只解码一次，采样识别与打码同时进行
+
+        解码后的帧先进入待输出队列，采样帧攒够一批（或队列达到上限、读到末尾）时批量OCR；
+        一帧只有在所有可能覆盖它的采样帧都完成识别后才打码输出
 
         Args:
             cap: 视频捕获对象
+            out: 视频写入器
             fps: 视频帧率
             total_frames: 总帧数
             sample_frame_interval: 采样间隔（帧数）
             buffer_frames: 缓冲帧数
+            max_pending: 待输出队列的最大帧数
             stats: 统计信息字典
+        """
+        batch_size = self.config.ocr_batch_size
+        pool = FramePool()
+        reader = ThreadedFrameReader(cap, queue_size=batch_size, pool=pool)
+        writer = ThreadedFrameWriter(out, queue_size=batch_size, pool=pool)
+
+        # 预先绑定循环内使用的对象和方法，减少每帧的属性查找
+        read_frame = reader.read
+        write_frame = writer.write
+        visualizer = self.visualizer
+        progress_callback = self.progress_callback
+        blur_frame = self._blur_frame_regions
+
+        # 统计量使用局部变量累加，结束时一次性写回
+        ocr_calls = 0
+        processed_frames = 0
+        frames_with_detections = 0
+        total_detections = 0
+        unique_detections = stats['unique_detections']
+
+        pending = deque()  # 待输出的 (帧索引, 帧)
+        samples = []  # 待识别的 (帧索引, 帧)
+        tracker = ActiveRegionTracker(merge_iou=self.REGION_MERGE_IOU)
+        pending_logs: List[str] = []
+
+        # 进度汇报倒数计数：回调每 0.5% 更新一次，控制台每 128 帧输出一次
+        report_interval = max(1, total_frames // 200) if progress_callback else 128
+        report_countdown = report_interval
+
+        read_idx = 0
+        next_sample_idx = 0  # 下一个采样帧的索引
+        reached_end = False
+        start_time = time.monotonic()
+        current_fps = 0.0
 
-        Returns:
-            检测区域列表
+        try:
+            while not reached_end:
+                ret, frame = read_frame()
+                if ret:
+                    pending.append((read_idx, frame))
+                    if read_idx == next_sample_idx and read_idx < total_frames:
+                        samples.append((read_idx, frame))
+                        next_sample_idx += sample_frame_interval
+                    read_idx += 1
+                else:
+                    reached_end = True
+
+                # 采样帧攒够一批、待输出帧达到上限或读到末尾时进行批量识别
+                if samples and (reached_end or len(samples) >= batch_size or len(pending) >= max_pending):
+                    regions, calls = self._detect_samples(
+                        samples, total_frames, buffer_frames,
+                        unique_detections, pending_logs, visualize=False
+                    )
+                    tracker.add(regions)
+                    ocr_calls += calls
+                    samples = []
+
+                    if pending_logs:
+                        self._log("\n".join(pending_logs))
+                        pending_logs.clear()
+
+                # 索引小于 ready_before 的帧，其打码区域已全部确定
+                if reached_end:
+                    ready_before = read_idx
+                else:
+                    first_unprocessed = samples[0][0] if samples else next_sample_idx
+                    if first_unprocessed >= total_frames and not samples:
+                        ready_before = read_idx
+                    else:
+                        ready_before = first_unprocessed - buffer_frames
+
+                while pending and pending[0][0] < ready_before:
+                    frame_idx, frame = pending.popleft()
+
+                    # 每 32 帧采样一次时钟更新处理速度，避免每帧调用计时函数
+                    if not frame_idx & 0x1F:
+                        elapsed = time.monotonic() - start_time
+                        current_fps = frame_idx / elapsed if elapsed > 0 else 0
+
+                    # 收集当前帧需要打码的区域
+                    current_regions = tracker.active_at(frame_idx)
+                    processed_frame = blur_frame(frame, tracker.current_rects)
+                    current_frame_detections = tracker.active_count
+
+                    # 可视化
+                    if visualizer:
+                        detections = [(r.bbox, r.text, r.confidence) for r in current_regions]
+                        should_continue = visualizer.show_frame(
+                            frame=frame,
+                            frame_idx=frame_idx,
+                            total_frames=total_frames,
+                            detections=detections,
+                            detection_mask=[True] * len(detections),
+                            fps=current_fps,
+                            wait_key=1
+                        )
+                        if not should_continue:
+                            self._log("\n用户从可视化窗口退出", 'warning')
+                            raise KeyboardInterrupt("用户请求退出")
+
+                    # 写入输出视频
+                    write_frame(processed_frame)
+
+                    processed_frames += 1
+                    if current_frame_detections > 0:
+                        frames_with_detections += 1
+                        total_detections += current_frame_detections
+
+                    # 调用打码回调
+                    if progress_callback and current_frame_detections > 0:
+                        progress_callback.on_blur(frame_idx, len(current_regions))
+
+                    # 更新进度
+                    report_countdown -= 1
+                    if not report_countdown or frame_idx + 1 == total_frames:
+                        report_countdown = report_interval
+                        if progress_callback:
+                            progress_callback.on_progress(
+                                frame_idx + 1,
+                                total_frames,
+                                phase='processing'
+                            )
+                        else:
+                            progress = ((frame_idx + 1) / total_frames) * 100
+                            self._log(f"  处理进度: {frame_idx + 1}/{total_frames} ({progress:.1f}%)")
+        finally:
+            reader.close()
+            writer.close()
+            stats['ocr_calls'] = ocr_calls
+            stats['processed_frames'] = processed_frames
+            stats['frames_with_detections'] = frames_with_detections
+            stats['total_detections'] = total_detections
+
+        self._log(f"\n处理完成: 共 {ocr_calls} 次 OCR 调用", 'success')
+
+    def _detect_samples(
+        self,
+        samples: List[Tuple[int, np.ndarray]],
+        total_frames: int,
+        buffer_frames: int,
+        unique_detections: set,
+        pending_logs: List[str],
+        visualize: bool = True
+    ) -> Tuple[List[DetectionRegion], int]:
         """
-        detection_regions: List[DetectionRegion] = []
-        frame_idx = 0
+        对一批采样帧进行批量OCR，并为检测到的目标生成打码区域
 
-        while frame_idx < total_frames:
-            # 跳到采样帧
-            cap.set(cv2.CAP_PROP_POS_FRAMES, frame_idx)
-            ret, frame = cap.read()
-            if not ret:
-                break
+        Args:
+            samples: [(帧索引, 帧), ...]
+            total_frames: 总帧数
+            buffer_frames: 缓冲帧数
+            unique_detections: 不重复目标集合（原地更新）
+            pending_logs: 无回调时缓存的检测日志（原地追加）
+            visualize: 是否在可视化窗口中显示采样帧的识别结果
 
-            # 进行 OCR 识别
-            detections = self.ocr_detector.detect_text(frame)
-            stats['ocr_calls'] += 1
+        Returns:
+            (新增的检测区域列表, OCR调用次数)
+        """
+        progress_callback = self.progress_callback
+        presence_threshold = self.config.text_presence_threshold
+        regions: List[DetectionRegion] = []
 
-            # 通知UI OCR调用
-            if self.progress_callback:
-                self.progress_callback.on_ocr_call()
+        # 边缘过少的帧不可能包含文字，不参与OCR
+        if presence_threshold > 0:
+            needs_ocr = [self._edge_density(frame) >= presence_threshold for _, frame in samples]
+        else:
+            needs_ocr = [True] * len(samples)
+
+        # 画面与已识别帧几乎相同的采样帧直接复用缓存结果
+        sample_cache = self._sample_cache
+        cache_keys: List[Optional[int]] = [None] * len(samples)
+        ocr_indices = []
+        for i, ((_, frame), need) in enumerate(zip(samples, needs_ocr)):
+            if not need:
+                continue
+            if sample_cache is not None:
+                cache_keys[i], hit = sample_cache.lookup(frame)
+                if hit:
+                    continue
+            ocr_indices.append(i)
+
+        # 进行批量 OCR 识别（按 ocr_max_side 缩小后检测，检测框映射回原始分辨率）
+        ocr_frames = [samples[i][1] for i in ocr_indices]
+        ocr_results = dict(zip(
+            ocr_indices,
+            self._detect_text_batch(ocr_frames) if ocr_frames else []
+        ))
+        if sample_cache is not None:
+            for i in ocr_indices:
+                sample_cache.store(cache_keys[i], ocr_results[i])
 
-            # 创建检测标记列表
-            detection_mask = []
+        # 通知UI OCR调用
+        if progress_callback:
+            for _ in ocr_frames:
+                progress_callback.on_ocr_call()
+
+        for i, (frame_idx, frame) in enumerate(samples):
+            if i in ocr_results:
+                detections = ocr_results[i]
+            elif cache_keys[i] is not None:
+                detections = sample_cache.get(cache_keys[i])
+            else:
+                detections = []
 
             # 查找目标模式
-            for bbox, text, confidence in detections:
-                is_pattern = self.detector.contains_pattern(text, strict=True)
-                detection_mask.append(is_pattern)
-
-                if is_pattern:
-                    # 确定打码区域
-                    blur_bbox = bbox  # 默认使用原始bbox
-
-                    # 如果启用精确定位，尝试精确定位目标模式
-                    if self.precise_locator:
-                        result = self.precise_locator.refine_pattern_bbox(
-                            frame, bbox, text, debug=False
-                        )
-                        if result is not None:
-                            # 实际进行了精确定位
-                            refined_bbox, refined_text = result
-                            blur_bbox = refined_bbox
-                            if self.progress_callback:
-                                self.progress_callback.on_log(
-                                    f"帧 {frame_idx}: 精确定位 '{text}' → '{refined_text}'", 'success'
-                                )
-
-                    # 计算打码范围
-                    start_frame = max(0, frame_idx - buffer_frames)
-                    end_frame = min(total_frames - 1, frame_idx + buffer_frames)
-
-                    region = DetectionRegion(
-                        bbox=blur_bbox,
-                        text=text,
-                        confidence=confidence,
-                        start_frame=start_frame,
-                        end_frame=end_frame
-                    )
-                    detection_regions.append(region)
+            detection_mask, targets = self._locate_targets(frame, frame_idx, detections)
 
-                    stats['unique_detections'].add(text)
+            for blur_bbox, text, confidence in targets:
+                # 计算打码范围
+                start_frame = max(0, frame_idx - buffer_frames)
+                end_frame = min(total_frames - 1, frame_idx + buffer_frames)
 
-                    # 通知检测到目标
-                    if self.progress_callback:
-                        self.progress_callback.on_detected(
-                            frame_idx, text, confidence
-                        )
-                    else:
-                        self._log(f"  [帧 {frame_idx}] 检测到目标: {text} "
-                                 f"(置信度: {confidence:.2f}, 打码范围: {start_frame}-{end_frame})")
+                regions.append(DetectionRegion(
+                    bbox=blur_bbox,
+                    text=text,
+                    confidence=confidence,
+                    start_frame=start_frame,
+                    end_frame=end_frame
+                ))
+
+                unique_detections.add(text)
+
+                # 通知检测到目标
+                if progress_callback:
+                    progress_callback.on_detected(
+                        frame_idx, text, confidence
+                    )
+                else:
+                    pending_logs.append(
+                        f"  [帧 {frame_idx}] 检测到目标: {text} "
+                        f"(置信度: {confidence:.2f}, 打码范围: {start_frame}-{end_frame})"
+                    )
 
             # 可视化
-            if self.visualizer:
+            if visualize and self.visualizer:
                 should_continue = self.visualizer.show_frame(
                     frame=frame,
                     frame_idx=frame_idx,
@@ -564,20 +1234,94 @@ class VideoProcessor:
                     self._log("\n用户从可视化窗口退出", 'warning')
                     raise KeyboardInterrupt("用户请求退出")
 
-            # 跳到下一个采样点
-            frame_idx += sample_frame_interval
+        return regions, len(ocr_frames)
 
-            # 更新进度
-            if self.progress_callback:
-                self.progress_callback.on_progress(
-                    min(frame_idx, total_frames),
-                    total_frames,
-                    phase='sampling'
+    def _sampling_phase(
+        self,
+        cap: cv2.VideoCapture,
+        fps: int,
+        total_frames: int,
+        sample_frame_interval: int,
+        buffer_frames: int,
+        stats: Dict[str, Any]
+    ) -> List[DetectionRegion]:
+        """
+        采样识别阶段（两遍处理的第一遍）
+
+        按采样间隔读取帧，每攒够 ocr_batch_size 个采样帧进行一次批量OCR
+
+        Args:
+            cap: 视频捕获对象
+            fps: 视频帧率
+            total_frames: 总帧数
+            sample_frame_interval: 采样间隔（帧数）
+            buffer_frames: 缓冲帧数
+            stats: 统计信息字典
+
+        Returns:
+            检测区域列表
+        """
+        detection_regions: List[DetectionRegion] = []
+        read_idx = 0  # 下一个采样帧的索引
+        reached_end = False
+
+        # 统计量使用局部变量累加，结束时一次性写回
+        ocr_calls = stats['ocr_calls']
+        unique_detections = stats['unique_detections']
+        progress_callback = self.progress_callback
+        batch_size = self.config.ocr_batch_size
+
+        # 无回调时的逐条检测日志先缓存，随进度输出一起批量打印，避免每个目标单独写终端
+        pending_logs: List[str] = []
+
+        try:
+            while not reached_end and read_idx < total_frames:
+                # 读取一批采样帧（grab 推进码流，仅对采样帧 retrieve 解码）
+                samples = []  # [(帧索引, 帧), ...]
+                while len(samples) < batch_size and read_idx < total_frames:
+                    ret = cap.grab()
+                    if ret:
+                        ret, frame = cap.retrieve()
+                    if not ret:
+                        reached_end = True
+                        break
+                    samples.append((read_idx, frame))
+
+                    # 跳到下一个采样点
+                    # 中间帧只 grab 不 retrieve，避免 cap.set() 的关键帧重定位和多余的解码输出
+                    for _ in range(sample_frame_interval - 1):
+                        if not cap.grab():
+                            break
+                    read_idx += sample_frame_interval
+
+                if not samples:
+                    break
+
+                regions, calls = self._detect_samples(
+                    samples, total_frames, buffer_frames, unique_detections, pending_logs
                 )
-            elif stats['ocr_calls'] % 5 == 0:
-                progress = (frame_idx / total_frames) * 100
-                self._log(f"  识别进度: {min(frame_idx, total_frames)}/{total_frames} "
-                         f"({progress:.1f}%) - 已识别 {len(detection_regions)} 个区域")
+                detection_regions.extend(regions)
+                ocr_calls += calls
+
+                # 更新进度（每批一次）
+                progress_idx = min(read_idx, total_frames)
+                if progress_callback:
+                    progress_callback.on_progress(
+                        progress_idx,
+                        total_frames,
+                        phase='sampling'
+                    )
+                else:
+                    if pending_logs:
+                        self._log("\n".join(pending_logs))
+                        pending_logs.clear()
+                    progress = (progress_idx / total_frames) * 100
+                    self._log(f"  识别进度: {progress_idx}/{total_frames} "
+                             f"({progress:.1f}%) - 已识别 {len(detection_regions)} 个区域")
+        finally:
+            if pending_logs:
+                self._log("\n".join(pending_logs))
+            stats['ocr_calls'] = ocr_calls
 
         return detection_regions
 
@@ -591,7 +1335,7 @@ class VideoProcessor:
         stats: Dict[str, Any]
     ):
         """
-        打码应用阶段
+        打码应用阶段（两遍处理的第二遍）
 
         Args:
             cap: 视频捕获对象
@@ -604,88 +1348,250 @@ class VideoProcessor:
         # 重置到开头
         cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
 
+        # 解码和编码放到后台线程，与打码并行执行；编码完成的帧回收给解码复用
+        pool = FramePool()
+        reader = ThreadedFrameReader(cap, queue_size=8, pool=pool)
+        writer = ThreadedFrameWriter(out, queue_size=8, pool=pool)
+
+        # 预先绑定循环内使用的对象和方法，减少每帧的属性查找
+        read_frame = reader.read
+        write_frame = writer.write
+        visualizer = self.visualizer
+        progress_callback = self.progress_callback
+        blur_frame = self._blur_frame_regions
+        tracker = ActiveRegionTracker(detection_regions, merge_iou=self.REGION_MERGE_IOU)
+        active_at = tracker.active_at
+
+        # 进度汇报倒数计数：回调每 0.5% 更新一次，控制台每 5 秒视频输出一次
+        report_interval = max(1, total_frames // 200) if progress_callback else max(1, fps * 5)
+        report_countdown = report_interval
+
+        # 统计量使用局部变量累加，结束时一次性写回
+        processed_frames = stats['processed_frames']
+        frames_with_detections = stats['frames_with_detections']
+        total_detections = stats['total_detections']
+
         frame_idx = 0
-        start_time = time.time()
-        last_fps_update = start_time
+        start_time = time.monotonic()
         current_fps = 0.0
 
-        while True:
-            ret, frame = cap.read()
-            if not ret:
-                break
-
-            # 计算当前处理速度
-            current_time = time.time()
-            if current_time - last_fps_update >= 1.0:
-                elapsed = current_time - start_time
-                current_fps = frame_idx / elapsed if elapsed > 0 else 0
-                last_fps_update = current_time
-
-            processed_frame = frame.copy()
-            current_frame_detections = 0
-
-            # 收集当前帧需要打码的区域
-            current_regions = []
-            for region in detection_regions:
-                if region.start_frame <= frame_idx <= region.end_frame:
-                    current_regions.append(region)
-                    processed_frame = apply_blur(
-                        processed_frame,
-                        region.bbox,
-                        method=self.config.blur_method,
-                        strength=self.config.blur_strength
+        try:
+            while True:
+                ret, frame = read_frame()
+                if not ret:
+                    break
+
+                # 每 32 帧采样一次时钟更新处理速度，避免每帧调用计时函数
+                if not frame_idx & 0x1F:
+                    elapsed = time.monotonic() - start_time
+                    current_fps = frame_idx / elapsed if elapsed > 0 else 0
+
+                # 收集当前帧需要打码的区域
+                current_regions = active_at(frame_idx)
+                processed_frame = blur_frame(frame, tracker.current_rects)
+                current_frame_detections = tracker.active_count
+
+                # 可视化
+                if visualizer:
+                    detections = [(r.bbox, r.text, r.confidence) for r in current_regions]
+                    detection_mask = [True] * len(detections)
+
+                    should_continue = visualizer.show_frame(
+                        frame=frame,
+                        frame_idx=frame_idx,
+                        total_frames=total_frames,
+                        detections=detections,
+                        detection_mask=detection_mask,
+                        fps=current_fps,
+                        wait_key=1
                     )
-                    current_frame_detections += 1
+                    if not should_continue:
+                        self._log("\n用户从可视化窗口退出", 'warning')
+                        raise KeyboardInterrupt("用户请求退出")
 
-            # 可视化
-            if self.visualizer:
-                detections = [(r.bbox, r.text, r.confidence) for r in current_regions]
-                detection_mask = [True] * len(detections)
+                # 写入输出视频
+                write_frame(processed_frame)
 
-                should_continue = self.visualizer.show_frame(
-                    frame=frame,
-                    frame_idx=frame_idx,
-                    total_frames=total_frames,
-                    detections=detections,
-                    detection_mask=detection_mask,
-                    fps=current_fps,
-                    wait_key=1
-                )
-                if not should_continue:
-                    self._log("\n用户从可视化窗口退出", 'warning')
-                    raise KeyboardInterrupt("用户请求退出")
+                processed_frames += 1
+                if current_frame_detections > 0:
+                    frames_with_detections += 1
+                    total_detections += current_frame_detections
+
+                frame_idx += 1
+
+                # 调用打码回调
+                if progress_callback and current_frame_detections > 0:
+                    progress_callback.on_blur(frame_idx - 1, len(current_regions))
+
+                # 更新进度
+                report_countdown -= 1
+                if not report_countdown or frame_idx == total_frames:
+                    report_countdown = report_interval
+                    if progress_callback:
+                        progress_callback.on_progress(
+                            frame_idx,
+                            total_frames,
+                            phase='blurring'
+                        )
+                    else:
+                        progress = (frame_idx / total_frames) * 100
+                        self._log(f"  打码进度: {frame_idx}/{total_frames} ({progress:.1f}%)")
+        finally:
+            reader.close()
+            writer.close()
+            stats['processed_frames'] = processed_frames
+            stats['frames_with_detections'] = frames_with_detections
+            stats['total_detections'] = total_detections
 
-            # 写入输出视频
-            out.write(processed_frame)
+    def _blur_frame_regions(
+        self,
+        frame: np.ndarray,
+        rects: List[Tuple[int, int, int, int]]
+    ) -> np.ndarray:
+        """
+        对帧应用当前生效的所有检测区域的打码
 
-            stats['processed_frames'] += 1
-            if current_frame_detections > 0:
-                stats['frames_with_detections'] += 1
-                stats['total_detections'] += current_frame_detections
+        Args:
+            frame: 解码得到的原始帧（每帧独立分配，无区域时原样返回，否则可能被原地修改）
+            rects: 当前帧生效区域的外接矩形 (x_min, y_min, x_max, y_max)
 
-            frame_idx += 1
+        Returns:
+            打码后的帧
+        """
+        # 没有生效区域的帧直接写出解码缓冲区
+        if not rects:
+            return frame
+
+        # 原地打码，仅当可视化需要显示未打码的原始帧时才拷贝
+        processed_frame = frame.copy() if self.visualizer else frame
+        # 多个区域统一处理：位置集中时外接矩形只模糊一次，分散时并行逐个打码；
+        # 区域的外接矩形在创建时已计算，无需每帧从顶点重新计算
+        return apply_blur_rects(
+            processed_frame,
+            rects,
+            method=self.config.blur_method,
+            strength=self.config.blur_strength,
+            executor=self._blur_pool,
+            gpu_blur=self._gpu_blur
+        )
 
-            # 调用打码回调
-            if self.progress_callback and current_frame_detections > 0:
-                self.progress_callback.on_blur(frame_idx - 1, current_frame_detections)
+    def _detect_text_batch(
+        self,
+        frames: List[np.ndarray]
+    ) -> List[List[Tuple[np.ndarray, str, float]]]:
+        """
+        批量OCR检测，按配置先将帧缩小到最长边不超过 ocr_max_side 再检测，
+        并将检测框坐标映射回原始分辨率
 
-            # 更新进度
-            if self.progress_callback:
-                self.progress_callback.on_progress(
-                    frame_idx,
-                    total_frames,
-                    phase='blurring'
-                )
-            elif frame_idx % (fps * 5) == 0 or frame_idx == total_frames:
-                progress = (frame_idx / total_frames) * 100
-                self._log(f"  打码进度: {frame_idx}/{total_frames} ({progress:.1f}%)")
+        Args:
+            frames: 输入帧列表
+
+        Returns:
+            与输入帧一一对应的检测结果列表
+        """
+        max_side = self.config.ocr_max_side
+        if max_side <= 0:
+            return self.ocr_detector.detect_text_batch(frames, self._text_filter)
+
+        scales = []
+        ocr_inputs = []
+        for frame in frames:
+            scale = min(1.0, max_side / max(frame.shape[:2]))
+            if scale < 1.0:
+                frame = cv2.resize(frame, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+            scales.append(scale)
+            ocr_inputs.append(frame)
+
+        batch_detections = self.ocr_detector.detect_text_batch(ocr_inputs, self._text_filter)
+
+        return [
+            detections if scale == 1.0 else [
+                (np.rint(bbox / scale).astype(np.int32), text, confidence)
+                for bbox, text, confidence in detections
+            ]
+            for detections, scale in zip(batch_detections, scales)
+        ]
+
+    @staticmethod
+    def _frame_signature(frame: np.ndarray) -> np.ndarray:
+        """
+        计算帧的缩略灰度签名，用于快速判断相邻帧是否近似相同
+
+        Args:
+            frame: 输入帧（BGR格式）
+
+        Returns:
+            32x32 的 int16 灰度缩略图
+        """
+        small = cv2.resize(frame, (32, 32), interpolation=cv2.INTER_AREA)
+        return cv2.cvtColor(small, cv2.COLOR_BGR2GRAY).astype(np.int16)
+
+    @staticmethod
+    def _edge_density(frame: np.ndarray) -> float:
+        """
+        计算帧的 Canny 边缘像素占比，用于快速判断帧内是否可能存在文字
+
+        Args:
+            frame: 输入帧（BGR格式）
+
+        Returns:
+            边缘像素占全部像素的比例 (0-1)
+        """
+        edges = cv2.Canny(cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY), 100, 200)
+        return cv2.countNonZero(edges) / edges.size
+
+    def _locate_targets(
+        self,
+        frame: np.ndarray,
+        frame_idx: int,
+        detections: List[Tuple[np.ndarray, str, float]]
+    ) -> Tuple[List[bool], List[Tuple[np.ndarray, str, float]]]:
+        """
+        从OCR结果中筛选包含目标模式的文本，并确定各自的打码区域
+
+        启用精确定位时，同一帧内的所有目标一起迭代定位，每轮只进行一次批量OCR调用
+
+        Args:
+            frame: 原始帧（未打码）
+            frame_idx: 帧索引
+            detections: OCR检测结果 [(bbox, text, confidence), ...]
+
+        Returns:
+            (检测标记列表, 目标列表 [(打码bbox, text, confidence), ...])
+        """
+        # 检查每个文本是否包含目标模式
+        detection_mask = self.detector.contains_pattern_batch([text for _, text, _ in detections])
+        targets = [
+            detection for detection, is_pattern in zip(detections, detection_mask)
+            if is_pattern
+        ]
+
+        # 如果启用精确定位，尝试精确定位目标模式，默认使用原始bbox
+        if self.precise_locator and targets:
+            results = self.precise_locator.refine_pattern_bboxes(
+                frame, [(bbox, text) for bbox, text, _ in targets], debug=False
+            )
+            for i, result in enumerate(results):
+                if result is None:
+                    continue
+                # 实际进行了精确定位
+                refined_bbox, refined_text = result
+                _, text, confidence = targets[i]
+                targets[i] = (refined_bbox, text, confidence)
+                if self.progress_callback:
+                    self.progress_callback.on_log(
+                        f"帧 {frame_idx}: 精确定位 '{text}' → '{refined_text}'", 'success'
+                    )
+
+        return detection_mask, targets
 
     def _process_single_frame(
         self,
         frame: np.ndarray,
         frame_idx: int,
         total_frames: int,
-        current_fps: float
+        current_fps: float,
+        detections: Optional[List[Tuple[np.ndarray, str, float]]] = None
     ) -> Tuple[np.ndarray, int]:
         """
         处理单帧图像，检测并打码目标内容
@@ -695,6 +1601,7 @@ class VideoProcessor:
             frame_idx: 当前帧索引
             total_frames: 总帧数
             current_fps: 当前处理帧率
+            detections: 预先批量获得的OCR结果（为None时对当前帧单独进行OCR）
 
         Returns:
             (处理后的帧, 检测到的目标数量)
@@ -703,54 +1610,39 @@ class VideoProcessor:
             return frame, 0
 
         # 使用OCR检测文本
-        detections = self.ocr_detector.detect_text(frame)
+        if detections is None:
+            detections = self.ocr_detector.detect_text(frame, self._text_filter)
 
-        # 通知UI OCR调用
-        if self.progress_callback:
-            self.progress_callback.on_ocr_call()
-
-        processed_frame = frame.copy()
-        detection_count = 0
-        detection_mask = []  # 标记哪些检测是目标
-
-        # 遍历所有检测到的文本
-        for bbox, text, confidence in detections:
-            # 检查是否包含目标模式
-            is_pattern = self.detector.contains_pattern(text)
-            detection_mask.append(is_pattern)
-
-            if is_pattern:
-                # 确定打码区域
-                blur_bbox = bbox  # 默认使用原始bbox
-
-                # 如果启用精确定位，尝试精确定位目标模式
-                if self.precise_locator:
-                    result = self.precise_locator.refine_pattern_bbox(
-                        frame, bbox, text, debug=False
-                    )
-                    if result is not None:
-                        # 实际进行了精确定位
-                        refined_bbox, refined_text = result
-                        blur_bbox = refined_bbox
-                        if self.progress_callback:
-                            self.progress_callback.on_log(
-                                f"帧 {frame_idx}: 精确定位 '{text}' → '{refined_text}'", 'success'
-                            )
+            # 通知UI OCR调用
+            if self.progress_callback:
+                self.progress_callback.on_ocr_call()
+
+        # 查找目标模式，确定打码区域（全部确定后再统一打码，保证精确定位使用未打码的原始帧）
+        detection_mask, targets = self._locate_targets(frame, frame_idx, detections)
+        blur_bboxes = [blur_bbox for blur_bbox, _, _ in targets]
+        detection_count = len(targets)
 
-                # 应用打码
-                processed_frame = apply_blur(
-                    processed_frame,
-                    blur_bbox,
-                    method=self.config.blur_method,
-                    strength=self.config.blur_strength
+        # 通知检测到目标
+        if self.progress_callback:
+            for _, text, confidence in targets:
+                self.progress_callback.on_detected(
+                    frame_idx, text, confidence
                 )
-                detection_count += 1
 
-                # 通知检测到目标
-                if self.progress_callback:
-                    self.progress_callback.on_detected(
-                        frame_idx, text, confidence
-                    )
+        # 应用打码：原地修改解码帧，仅当可视化需要显示未打码的原始帧时才拷贝；
+        # 无目标的帧直接返回解码缓冲区写入输出
+        processed_frame = frame
+        if blur_bboxes:
+            if self.visualizer:
+                processed_frame = frame.copy()
+            apply_blur_regions(
+                processed_frame,
+                blur_bboxes,
+                method=self.config.blur_method,
+                strength=self.config.blur_strength,
+                executor=self._blur_pool,
+                gpu_blur=self._gpu_blur
+            )
 
         # 如果启用了可视化，显示检测结果
         if self.visualizer:
@@ -2,14 +2,17 @@
 FastAPI 服务器 - 视频内容脱敏 API
 提供上传视频、查询进度、下载结果的REST API接口
 """
+import os
 import shutil
+import asyncio
+import hashlib
 import argparse
 from pathlib import Path
 from typing import Optional
 from datetime import datetime
 
-from fastapi import FastAPI, File, UploadFile, HTTPException, Form, Query
-from fastapi.responses import FileResponse
+from fastapi import FastAPI, File, UploadFile, HTTPException, Form, Query, Header
+from fastapi.responses import FileResponse, StreamingResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field
 
@@ -23,6 +26,12 @@ UPLOAD_DIR: Optional[Path] = None
 OUTPUT_DIR: Optional[Path] = None
 TASKS_DIR: Optional[Path] = None
 
+# 上传文件落盘的分块大小
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+# 推送任务进度时检查任务状态的间隔（秒）
+TASK_WATCH_INTERVAL = 0.5
+
 
 def init_directories(data_dir: str = None):
     """
@@ -96,7 +105,7 @@ class TaskStatusResponse(BaseModel):
     completed_at: Optional[str] = Field(None, description="完成时间")
     error: Optional[str] = Field(None, description="错误信息（仅失败时）")
     result: Optional[dict] = Field(None, description="处理结果统计（仅成功时）")
-    current_step: Optional[str] = Field(None, description="当前步骤: detection/masking/compression")
+    current_step: Optional[str] = Field(None, description="当前步骤: detection/masking/processing/compression")
     current_step_progress: float = Field(0.0, description="当前步骤进度 0-100")
 
 
@@ -106,6 +115,79 @@ class TaskListResponse(BaseModel):
     tasks: list[TaskStatusResponse] = Field(..., description="任务列表")
 
 
+# ====== 辅助函数 ======
+
+def _build_status_response(task) -> TaskStatusResponse:
+    """
+    将任务对象转换为状态响应
+
+    Args:
+        task: 任务对象
+
+    Returns:
+        任务状态响应
+    """
+    return TaskStatusResponse(
+        task_id=task.task_id,
+        status=task.status.value,
+        progress=task.progress,
+        message=task.message,
+        created_at=task.created_at,
+        started_at=task.started_at,
+        completed_at=task.completed_at,
+        error=task.error,
+        result=task.result,
+        current_step=task.current_step,
+        current_step_progress=task.current_step_progress
+    )
+
+
+def _save_upload(source, path: Path, size: Optional[int] = None):
+    """
+    将上传的文件按 1MB 分块流式写入磁盘，不在内存中保留整个视频
+
+    Args:
+        source: 上传文件对象
+        path: 保存路径
+        size: 文件大小（已知时预先分配磁盘空间，减少写入过程中的碎片和元数据更新）
+    """
+    with open(path, "wb") as buffer:
+        if size and hasattr(os, 'posix_fallocate'):
+            try:
+                os.posix_fallocate(buffer.fileno(), 0, size)
+            except OSError:
+                # 文件系统不支持预分配时直接写入
+                pass
+        shutil.copyfileobj(source, buffer, UPLOAD_CHUNK_SIZE)
+
+
+async def _watch_task(task_id: str):
+    """
+    监视任务状态，状态或进度发生变化时产出最新状态，任务结束或被删除后停止
+
+    Args:
+        task_id: 任务ID
+
+    Yields:
+        任务状态响应
+    """
+    task_queue = get_task_queue()
+    last_key = None
+    while True:
+        task = task_queue.get_task(task_id)
+        if not task:
+            return
+
+        key = (task.status, task.progress, task.message, task.current_step, task.current_step_progress)
+        if key != last_key:
+            last_key = key
+            yield _build_status_response(task)
+
+        if task.status in (TaskStatus.COMPLETED, TaskStatus.FAILED):
+            return
+        await asyncio.sleep(TASK_WATCH_INTERVAL)
+
+
 # ====== API 路由 ======
 
 @app.get("/", tags=["基础"])
@@ -128,13 +210,13 @@ async def health():
     }
 
 
-@app.post("api/tasks", response_model=TaskCreateResponse, tags=["任务管理"])
+@app.post("/api/tasks", response_model=TaskCreateResponse, tags=["任务管理"])
 async def create_task(
     file: UploadFile = File(..., description="要处理的视频文件"),
     detector_type: str = Form("phone", description="检测器类型: phone/keyword/idcard"),
     keywords: Optional[str] = Form(None, description="关键字列表（逗号分隔，仅keyword检测器）"),
     case_sensitive: bool = Form(False, description="关键字是否区分大小写"),
-    blur_method: str = Form("gaussian", description="打码方式: gaussian/pixelate/black"),
+    blur_method: str = Form("gaussian", description="打码方式: gaussian/gaussian_exact/pixelate/black"),
     blur_strength: int = Form(51, description="模糊强度（仅高斯模糊）"),
     device: str = Form("cpu", description="计算设备: cpu, gpu:0, gpu:1, etc."),
     sample_interval: float = Form(1.0, description="采样间隔（秒）"),
@@ -149,7 +231,7 @@ async def create_task(
     - **detector_type**: 检测器类型，可选 phone（手机号）、keyword（关键字）、idcard（身份证号）
     - **keywords**: 关键字列表（逗号分隔，仅当detector_type=keyword时有效）
     - **case_sensitive**: 关键字是否区分大小写
-    - **blur_method**: 打码方式，可选 gaussian（高斯模糊）、pixelate（像素化）、black（黑色遮挡）
+    - **blur_method**: 打码方式，可选 gaussian（高斯模糊）、gaussian_exact（精确高斯模糊，较慢）、pixelate（像素化）、black（黑色遮挡）
     - **blur_strength**: 模糊强度，仅对高斯模糊有效，必须为奇数
     - **device**: 计算设备，格式为 'cpu' 或 'gpu:0', 'gpu:1' 等
     - **sample_interval**: 采样间隔（秒），建议0.5-2.0
@@ -177,7 +259,7 @@ async def create_task(
         if detector_type not in ['phone', 'keyword', 'idcard']:
             raise HTTPException(status_code=400, detail=f"不支持的检测器类型: {detector_type}")
 
-        if blur_method not in ['gaussian', 'pixelate', 'black']:
+        if blur_method not in ['gaussian', 'gaussian_exact', 'pixelate', 'black']:
             raise HTTPException(status_code=400, detail=f"不支持的打码方式: {blur_method}")
 
         # 验证device格式
@@ -201,9 +283,8 @@ async def create_task(
         output_filename = f"{timestamp}_masked_{file.filename}"
         output_path = OUTPUT_DIR / output_filename
 
-        # 保存上传的文件
-        with open(input_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
+        # 保存上传的文件（在线程池中执行，大文件复制期间不阻塞事件循环中的其他上传和查询请求）
+        await asyncio.to_thread(_save_upload, file.file, input_path, file.size)
 
         # 准备检测器参数
         detector_kwargs = {}
@@ -239,14 +320,18 @@ async def create_task(
         raise HTTPException(status_code=500, detail=f"创建任务失败: {str(e)}")
 
 
-@app.get("api/tasks/{task_id}", response_model=TaskStatusResponse, tags=["任务管理"])
-async def get_task_status(task_id: str):
+@app.get("/api/tasks/{task_id}", response_model=TaskStatusResponse, tags=["任务管理"])
+async def get_task_status(
+    task_id: str,
+    if_none_match: Optional[str] = Header(None, description="上次响应的 ETag，状态未变化时返回 304")
+):
     """
     查询任务进度
 
     - **task_id**: 任务ID（创建任务时返回）
 
-    返回任务的当前状态、进度和相关信息
+    返回任务的当前状态、进度和相关信息。响应带有 ETag，轮询时通过 If-None-Match 回传，
+    状态未变化时返回不含响应体的 304
     """
     task_queue = get_task_queue()
     task = task_queue.get_task(task_id)
@@ -254,53 +339,95 @@ async def get_task_status(task_id: str):
     if not task:
         raise HTTPException(status_code=404, detail=f"任务不存在: {task_id}")
 
-    return TaskStatusResponse(
-        task_id=task.task_id,
-        status=task.status.value,
-        progress=task.progress,
-        message=task.message,
-        created_at=task.created_at,
-        started_at=task.started_at,
-        completed_at=task.completed_at,
-        error=task.error,
-        result=task.result,
-        current_step=task.current_step,
-        current_step_progress=task.current_step_progress
+    body = _build_status_response(task).model_dump_json()
+    # ETag 只用于缓存校验，使用内置的非加密摘要（MD5 在启用 FIPS 的 Python 上不可用）
+    etag = f'"{hashlib.blake2b(body.encode(), digest_size=8).hexdigest()}"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+
+    if if_none_match and etag in (tag.strip() for tag in if_none_match.split(',')):
+        return Response(status_code=304, headers=headers)
+
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+@app.get("/api/tasks/{task_id}/events", tags=["任务管理"])
+async def task_events(task_id: str):
+    """
+    订阅任务进度（Server-Sent Events）
+
+    - **task_id**: 任务ID（创建任务时返回）
+
+    每当任务状态或进度变化时推送一条 `data: {任务状态JSON}` 事件，任务完成或失败后关闭连接，
+    客户端无需反复轮询
+    """
+    task_queue = get_task_queue()
+    if not task_queue.get_task(task_id):
+        raise HTTPException(status_code=404, detail=f"任务不存在: {task_id}")
+
+    async def event_stream():
+        async for status in _watch_task(task_id):
+            yield f"data: {status.model_dump_json()}\n\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"}
     )
 
 
-@app.get("api/tasks", response_model=TaskListResponse, tags=["任务管理"])
+@app.get("/api/tasks/{task_id}/stream", tags=["任务管理"])
+async def task_stream(task_id: str):
+    """
+    以 JSON Lines 流式返回任务进度
+
+    - **task_id**: 任务ID（创建任务时返回）
+
+    每当任务状态或进度变化时输出一行任务状态 JSON，任务完成或失败后结束响应，
+    适合直接逐行读取响应体的客户端（如 requests 的 iter_lines）
+    """
+    task_queue = get_task_queue()
+    if not task_queue.get_task(task_id):
+        raise HTTPException(status_code=404, detail=f"任务不存在: {task_id}")
+
+    async def line_stream():
+        async for status in _watch_task(task_id):
+            yield status.model_dump_json() + "\n"
+
+    return StreamingResponse(
+        line_stream(),
+        media_type="application/x-ndjson",
+        headers={"Cache-Control": "no-cache"}
+    )
+
+
+@app.get("/api/tasks", response_model=TaskListResponse, tags=["任务管理"])
 async def list_tasks(
     status: Optional[str] = Query(None, description="按状态过滤: pending/processing/completed/failed"),
-    limit: int = Query(100, ge=1, le=1000, description="返回任务数量限制")
+    limit: int = Query(100, ge=1, le=1000, description="返回任务数量限制"),
+    ids: Optional[str] = Query(None, description="只返回指定的任务（逗号分隔的任务ID）")
 ):
     """
     获取所有任务列表
 
     - **status**: 可选，按状态过滤
     - **limit**: 返回的最大任务数
+    - **ids**: 可选，逗号分隔的任务ID，一次请求查询多个任务的进度（不存在的ID被忽略）
     """
     task_queue = get_task_queue()
-    all_tasks = task_queue.get_all_tasks()
+
+    if ids:
+        # 按ID直接查找，无需复制和遍历全部任务
+        task_ids = dict.fromkeys(task_id.strip() for task_id in ids.split(','))
+        candidates = [task for task in map(task_queue.get_task, task_ids) if task]
+    else:
+        candidates = task_queue.get_all_tasks().values()
 
     # 过滤任务
     tasks = []
-    for task in all_tasks.values():
+    for task in candidates:
         if status and task.status.value != status:
             continue
-        tasks.append(TaskStatusResponse(
-            task_id=task.task_id,
-            status=task.status.value,
-            progress=task.progress,
-            message=task.message,
-            created_at=task.created_at,
-            started_at=task.started_at,
-            completed_at=task.completed_at,
-            error=task.error,
-            result=task.result,
-            current_step=task.current_step,
-            current_step_progress=task.current_step_progress
-        ))
+        tasks.append(_build_status_response(task))
 
     # 按创建时间倒序排序
     tasks.sort(key=lambda x: x.created_at, reverse=True)
@@ -314,7 +441,8 @@ async def list_tasks(
     )
 
 
-@app.get("api/tasks/{task_id}/download", tags=["任务管理"])
+@app.get("/api/tasks/{task_id}/download", tags=["任务管理"])
+@app.head("/api/tasks/{task_id}/download", include_in_schema=False)
 async def download_result(task_id: str):
     """
     下载处理后的视频文件
@@ -322,6 +450,7 @@ async def download_result(task_id: str):
     - **task_id**: 任务ID（创建任务时返回）
 
     返回处理后的视频文件，仅当任务状态为 completed 时可用
+    支持 Range 请求，下载中断后可从已接收的字节处续传
     """
     task_queue = get_task_queue()
     task = task_queue.get_task(task_id)
@@ -350,7 +479,7 @@ async def download_result(task_id: str):
     )
 
 
-@app.delete("api/tasks/{task_id}", tags=["任务管理"])
+@app.delete("/api/tasks/{task_id}", tags=["任务管理"])
 async def delete_task(task_id: str):
     """
     删除任务及其关联文件（输入文件和输出文件）
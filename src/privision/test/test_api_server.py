@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+测试 API 服务器的查询与下载接口
+验证断点续传下载、HEAD 请求、状态查询的 ETag、批量查询以及进度推送流
+"""
+import json
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from privision import server
+from privision.api.task_queue import Task, TaskQueue, TaskStatus
+
+OUTPUT_BYTES = bytes(range(256)) * 40
+
+
+@pytest.fixture
+def task_queue(tmp_path, monkeypatch):
+    """独立的任务队列，预置一个已完成任务和一个处理中任务"""
+    queue = TaskQueue(max_workers=1, storage_dir=tmp_path / 'tasks')
+
+    output_path = tmp_path / 'done.mp4'
+    output_path.write_bytes(OUTPUT_BYTES)
+    queue.tasks['done'] = Task(
+        task_id='done', input_path=str(tmp_path / 'in.mp4'), output_path=str(output_path),
+        status=TaskStatus.COMPLETED, progress=100.0, message='处理完成', created_at='2024-01-02T00:00:00'
+    )
+    queue.tasks['running'] = Task(
+        task_id='running', input_path=str(tmp_path / 'in2.mp4'), output_path=str(tmp_path / 'out2.mp4'),
+        status=TaskStatus.PROCESSING, progress=10.0, message='处理中', created_at='2024-01-01T00:00:00'
+    )
+
+    monkeypatch.setattr(server, 'get_task_queue', lambda *args, **kwargs: queue)
+    monkeypatch.setattr(server, 'TASK_WATCH_INTERVAL', 0.01)
+    yield queue
+    queue.running = False
+
+
+@pytest.fixture
+def client(task_queue):
+    return TestClient(server.app)
+
+
+def update_task_later(queue, task_id, updates, delay=0.05):
+    """在后台线程中依次修改任务状态，模拟处理进度"""
+    def run():
+        for fields in updates:
+            time.sleep(delay)
+            with queue.tasks_lock:
+                for name, value in fields.items():
+                    setattr(queue.tasks[task_id], name, value)
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    return thread
+
+
+def assert_progress_events(events, expected_progress):
+    """
+    检查推送的状态序列：首尾与预期一致、相邻两条不重复
+
+    中间的更新间隔很短，推送时可能被合并，因此只要求是预期进度序列的子序列
+    """
+    progress = [event['progress'] for event in events]
+    assert progress[0] == expected_progress[0]
+    assert progress[-1] == expected_progress[-1]
+    remaining = iter(expected_progress)
+    assert all(value in remaining for value in progress)
+    assert all(a != b for a, b in zip(events, events[1:]))
+
+
+PROGRESS_UPDATES = [
+    {'progress': 30.0},
+    {'progress': 30.0},  # 未变化，不应推送
+    {'progress': 70.0, 'current_step': 'processing'},
+    {'status': TaskStatus.COMPLETED, 'progress': 100.0},
+]
+
+
+# ====== 下载 ======
+
+def test_download_full(client):
+    """测试：完整下载并声明支持 Range"""
+    response = client.get('/api/tasks/done/download')
+    assert response.status_code == 200
+    assert response.content == OUTPUT_BYTES
+    assert response.headers['accept-ranges'] == 'bytes'
+
+
+def test_download_range(client):
+    """测试：Range 请求返回 206 和对应的字节区间"""
+    response = client.get('/api/tasks/done/download', headers={'Range': 'bytes=100-199'})
+    assert response.status_code == 206
+    assert response.content == OUTPUT_BYTES[100:200]
+    assert response.headers['content-range'] == f'bytes 100-199/{len(OUTPUT_BYTES)}'
+
+    # 续传：从已接收的字节处读到末尾
+    response = client.get('/api/tasks/done/download', headers={'Range': 'bytes=10000-'})
+    assert response.status_code == 206
+    assert response.content == OUTPUT_BYTES[10000:]
+
+
+def test_download_range_not_satisfiable(client):
+    """测试：超出文件大小的 Range 返回 416"""
+    response = client.get('/api/tasks/done/download', headers={'Range': f'bytes={len(OUTPUT_BYTES)}-'})
+    assert response.status_code == 416
+
+
+def test_download_head(client):
+    """测试：HEAD 请求只返回文件大小等响应头"""
+    response = client.head('/api/tasks/done/download')
+    assert response.status_code == 200
+    assert response.content == b''
+    assert int(response.headers['content-length']) == len(OUTPUT_BYTES)
+    assert response.headers['accept-ranges'] == 'bytes'
+
+    assert client.head('/api/tasks/running/download').status_code == 400
+    assert client.head('/api/tasks/missing/download').status_code == 404
+
+
+# ====== 状态查询 ======
+
+def test_status_etag(client, task_queue):
+    """测试：状态未变化时返回 304，变化后 ETag 随之改变"""
+    response = client.get('/api/tasks/running')
+    assert response.status_code == 200
+    assert response.json()['progress'] == 10.0
+    etag = response.headers['etag']
+    assert response.headers['cache-control'] == 'no-cache'
+
+    response = client.get('/api/tasks/running', headers={'If-None-Match': etag})
+    assert response.status_code == 304
+    assert response.content == b''
+    assert response.headers['etag'] == etag
+
+    # 列表形式的 If-None-Match 也能匹配
+    response = client.get('/api/tasks/running', headers={'If-None-Match': f'"other", {etag}'})
+    assert response.status_code == 304
+
+    task_queue.tasks['running'].progress = 20.0
+    response = client.get('/api/tasks/running', headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.json()['progress'] == 20.0
+    assert response.headers['etag'] != etag
+
+
+def test_status_not_found(client):
+    """测试：查询不存在的任务返回 404"""
+    assert client.get('/api/tasks/missing').status_code == 404
+
+
+def test_list_by_ids(client):
+    """测试：按ID批量查询时去重并忽略不存在的ID"""
+    response = client.get('/api/tasks', params={'ids': 'running, done,missing,running'})
+    assert response.status_code == 200
+    data = response.json()
+    assert data['total'] == 2
+    # 仍按创建时间倒序排列
+    assert [task['task_id'] for task in data['tasks']] == ['done', 'running']
+
+    data = client.get('/api/tasks', params={'ids': 'missing'}).json()
+    assert data == {'total': 0, 'tasks': []}
+
+    data = client.get('/api/tasks', params={'ids': 'done,running', 'status': 'processing'}).json()
+    assert [task['task_id'] for task in data['tasks']] == ['running']
+
+
+# ====== 进度推送 ======
+
+def test_events_stream(client, task_queue):
+    """测试：SSE 在状态变化时推送事件，任务完成后关闭连接"""
+    update_task_later(task_queue, 'running', PROGRESS_UPDATES)
+
+    with client.stream('GET', '/api/tasks/running/events') as response:
+        assert response.status_code == 200
+        assert response.headers['content-type'].startswith('text/event-stream')
+        body = response.read().decode()
+
+    events = [json.loads(chunk[len('data: '):]) for chunk in body.split('\n\n') if chunk]
+    assert_progress_events(events, [10.0, 30.0, 70.0, 100.0])
+    assert events[-1]['status'] == 'completed'
+
+
+def test_ndjson_stream(client, task_queue):
+    """测试：JSON Lines 流逐行输出状态变化，任务失败后结束响应"""
+    update_task_later(task_queue, 'running', PROGRESS_UPDATES[:-1] + [
+        {'status': TaskStatus.FAILED, 'error': 'boom'}
+    ])
+
+    with client.stream('GET', '/api/tasks/running/stream') as response:
+        assert response.status_code == 200
+        assert response.headers['content-type'] == 'application/x-ndjson'
+        lines = [json.loads(line) for line in response.iter_lines() if line]
+
+    assert_progress_events(lines, [10.0, 30.0, 70.0, 70.0])
+    assert lines[-1]['status'] == 'failed'
+    assert lines[-1]['error'] == 'boom'
+
+
+def test_stream_completed_task(client):
+    """测试：订阅已完成的任务时只推送一次最终状态"""
+    with client.stream('GET', '/api/tasks/done/stream') as response:
+        lines = [json.loads(line) for line in response.iter_lines() if line]
+    assert len(lines) == 1
+    assert lines[0]['status'] == 'completed'
+
+
+def test_stream_not_found(client):
+    """测试：订阅不存在的任务返回 404"""
+    assert client.get('/api/tasks/missing/events').status_code == 404
+    assert client.get('/api/tasks/missing/stream').status_code == 404
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
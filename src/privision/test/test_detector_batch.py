@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+测试检测器的批量匹配与快速预筛
+验证 contains_pattern_batch() 与逐条调用 contains_pattern() 的结果一致，
+may_contain_pattern() 不会漏判，以及匹配结果缓存在规则变化后失效
+"""
+import pytest
+
+from privision.core.detectors import PhoneDetector, IDCardDetector, KeywordDetector
+
+TEXTS = [
+    '',
+    'hello',
+    '13812345678',
+    '电话：138-1234-5678',
+    '手机 138 1234 5678',
+    '订单号 2138123456789012',
+    '12345678901',
+    '19912345678abc',
+    '11010519491231002X',
+    '身份证号 110105194912310021',
+    '110105194912310021999',
+    '密码 123456',
+    'Password: abc',
+    'mypassword',
+    '用户名 test',
+    '价格 138元',
+    '\n13812345678',
+    'x' * 200,
+]
+
+
+@pytest.mark.parametrize('detector', [
+    PhoneDetector(),
+    IDCardDetector(),
+    KeywordDetector(),
+    KeywordDetector(['Secret', '账号'], case_sensitive=True),
+], ids=['phone', 'idcard', 'keyword', 'keyword-case'])
+@pytest.mark.parametrize('strict', [True, False])
+def test_batch_matches_single(detector, strict):
+    """测试：批量匹配与逐条匹配结果一致"""
+    expected = [detector.contains_pattern(text, strict) for text in TEXTS]
+    assert detector.contains_pattern_batch(TEXTS, strict) == expected
+    # 打乱顺序和逐条批量调用也一致
+    reversed_texts = TEXTS[::-1]
+    assert detector.contains_pattern_batch(reversed_texts, strict) == expected[::-1]
+    for text, result in zip(TEXTS, expected):
+        assert detector.contains_pattern_batch([text], strict) == [result]
+    assert detector.contains_pattern_batch([], strict) == []
+
+
+@pytest.mark.parametrize('detector', [
+    PhoneDetector(),
+    IDCardDetector(),
+    KeywordDetector(),
+], ids=['phone', 'idcard', 'keyword'])
+def test_may_contain_pattern_no_false_negative(detector):
+    """测试：快速预筛返回False的文本一定不包含目标"""
+    for text in TEXTS:
+        for strict in (True, False):
+            if detector.contains_pattern(text, strict):
+                assert detector.may_contain_pattern(text), text
+
+
+def test_may_contain_pattern_rejects_short_digits():
+    """测试：数字不足的文本被快速预筛排除"""
+    assert not PhoneDetector().may_contain_pattern('价格 138元')
+    assert not IDCardDetector().may_contain_pattern('13812345678')
+    assert PhoneDetector().may_contain_pattern('13812345678')
+
+
+def test_pattern_cache_per_instance():
+    """测试：匹配结果缓存按实例隔离"""
+    first = KeywordDetector(['alpha'])
+    second = KeywordDetector(['beta'])
+    assert first.contains_pattern_cached('alpha beta')
+    assert second.contains_pattern_cached('alpha beta')
+    assert not first.contains_pattern_cached('beta')
+    assert not second.contains_pattern_cached('alpha')
+
+
+def test_pattern_cache_cleared_on_keyword_change():
+    """测试：关键字变化后缓存的匹配结果失效"""
+    detector = KeywordDetector(['alpha'])
+    assert detector.contains_pattern_batch(['hello beta']) == [False]
+
+    detector.add_keyword('beta')
+    assert detector.contains_pattern_batch(['hello beta']) == [True]
+
+    detector.remove_keyword('beta')
+    assert detector.contains_pattern_batch(['hello beta']) == [False]
+
+    detector.set_keywords(['hello'])
+    assert detector.contains_pattern_cached('hello beta')
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
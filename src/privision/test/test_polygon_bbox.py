@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+测试非四边形文本框的处理
+验证外接矩形计算和打码对任意顶点数的多边形都有效
+"""
+import numpy as np
+
+from privision.core.blur import apply_blur
+from privision.core.bbox_calculator import BboxCalculator
+from privision.core.ocr_detector import OCRDetector
+
+
+def test_non_quad_polygon():
+    """测试：五边形和三角形的外接矩形与 numpy 计算结果一致，且可正常打码"""
+    pentagon = np.array([[10, 12], [50, 5], [62.5, 30], [40, 50], [12, 41]], dtype=np.float32)
+    triangle = np.array([[70, 70], [90, 75], [80, 95]], dtype=np.int32)
+
+    for polygon in (pentagon, triangle):
+        expected = (
+            int(np.min(polygon[:, 0])), int(np.min(polygon[:, 1])),
+            int(np.max(polygon[:, 0])), int(np.max(polygon[:, 1]))
+        )
+        assert OCRDetector.get_bbox_rect(polygon) == expected
+
+        x_min, y_min, x_max, y_max = expected
+        crop = BboxCalculator.crop_image_by_bbox(np.zeros((100, 100, 3), dtype=np.uint8), polygon)
+        assert crop.shape[:2] == (y_max - y_min, x_max - x_min)
+
+        rng = np.random.RandomState(0)
+        image = rng.randint(0, 256, (100, 100, 3)).astype(np.uint8)
+        original = image.copy()
+        result = apply_blur(image, polygon, method='black')
+        assert np.all(result[y_min:y_max, x_min:x_max] == 0)
+        # 外接矩形以外的像素不受影响
+        outside = np.ones((100, 100), dtype=bool)
+        outside[y_min:y_max, x_min:x_max] = False
+        assert np.array_equal(result[outside], original[outside])
+
+
+if __name__ == '__main__':
+    test_non_quad_polygon()
+    print("所有测试通过")
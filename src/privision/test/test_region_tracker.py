@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+测试智能模式的生效区域跟踪器
+验证按帧查询的结果与线性扫描一致，以及区域合并和外接矩形缓存的刷新
+"""
+import random
+import time
+
+import numpy as np
+
+from privision.core.video_processor import ActiveRegionTracker, DetectionRegion
+
+
+def make_region(x: int, y: int, start: int, end: int, w: int = 40, h: int = 20) -> DetectionRegion:
+    """创建一个轴对齐矩形检测区域"""
+    bbox = np.array([[x, y], [x + w, y], [x + w, y + h], [x, y + h]], dtype=np.float32)
+    return DetectionRegion(bbox=bbox, text='13812345678', confidence=0.9, start_frame=start, end_frame=end)
+
+
+def linear_active(regions, frame_idx):
+    """参考实现：线性扫描全部区域"""
+    return [r for r in regions if r.start_frame <= frame_idx <= r.end_frame]
+
+
+def test_matches_linear_scan():
+    """测试：不合并时每帧的生效区域与线性扫描完全一致（含顺序）"""
+    rng = random.Random(0)
+    regions = []
+    for _ in range(200):
+        start = rng.randrange(0, 500)
+        regions.append(make_region(rng.randrange(0, 600), rng.randrange(0, 400), start, start + rng.randrange(0, 60)))
+
+    tracker = ActiveRegionTracker(regions)
+    for frame_idx in range(600):
+        active = tracker.active_at(frame_idx)
+        expected = linear_active(regions, frame_idx)
+        assert [id(r) for r in active] == [id(r) for r in expected], f"第 {frame_idx} 帧不一致"
+        assert tracker.current_rects == [r.rect for r in expected]
+        assert tracker.active_count == len(expected)
+
+
+def test_incremental_add():
+    """测试：边查询边添加区域（单遍处理的用法）与一次性添加结果一致"""
+    rng = random.Random(1)
+    regions = []
+    for _ in range(100):
+        start = rng.randrange(0, 300)
+        regions.append(make_region(rng.randrange(0, 600), rng.randrange(0, 400), start, start + rng.randrange(0, 30)))
+    regions.sort(key=lambda r: r.start_frame)
+
+    tracker = ActiveRegionTracker()
+    pending = list(regions)
+    for frame_idx in range(350):
+        # 只在区域起始帧之前添加，符合 add() 的约束
+        while pending and pending[0].start_frame <= frame_idx:
+            tracker.add([pending.pop(0)])
+        active = tracker.active_at(frame_idx)
+        assert [id(r) for r in active] == [id(r) for r in linear_active(regions, frame_idx)]
+
+
+def test_merge_adjacent_regions():
+    """测试：时间段相接且位置重叠的区域合并为一个，原始检测数仍分别统计"""
+    first = make_region(100, 100, 0, 10)
+    second = make_region(102, 101, 11, 20)
+    far = make_region(400, 300, 5, 15)
+
+    tracker = ActiveRegionTracker([first, second, far], merge_iou=0.5)
+
+    active = tracker.active_at(0)
+    assert active == [first]
+    assert tracker.active_count == 1
+
+    # 合并后第一个区域延续到第二个区域的结束帧
+    active = tracker.active_at(15)
+    assert active == [first, far]
+    assert first.end_frame == 20
+    # 外接矩形取两者的并集
+    assert first.rect == (100, 100, 142, 121)
+    assert tracker.active_count == 2
+
+    active = tracker.active_at(20)
+    assert active == [first]
+    assert tracker.active_at(21) == []
+    assert tracker.active_count == 0
+
+
+def test_merge_disabled_keeps_regions():
+    """测试：合并阈值为0时不合并任何区域"""
+    first = make_region(100, 100, 0, 10)
+    second = make_region(100, 100, 5, 20)
+    tracker = ActiveRegionTracker([first, second])
+
+    assert tracker.active_at(6) == [first, second]
+    assert tracker.active_count == 2
+    assert first.end_frame == 10
+
+
+def test_current_rects_refresh_after_merge():
+    """测试：合并扩大了生效区域的外接矩形时，缓存的矩形列表随之更新"""
+    first = make_region(100, 100, 0, 30)
+    tracker = ActiveRegionTracker(merge_iou=0.3)
+    tracker.add([first])
+
+    tracker.active_at(0)
+    assert tracker.current_rects == [(100, 100, 140, 120)]
+
+    # 生效区域集合不变，但矩形被合并扩大
+    tracker.add([make_region(110, 100, 5, 30)])
+    assert tracker.active_at(5) == [first]
+    assert tracker.current_rects == [(100, 100, 150, 120)]
+    assert tracker.active_count == 2
+
+
+def make_slot_regions(count: int, seed: int = 0, slots: int = 20):
+    """在互不重叠的若干位置上生成按起始帧递增的区域，同一位置的区域外接矩形相同"""
+    rng = random.Random(seed)
+    starts = sorted(rng.randrange(0, count * 2) for _ in range(count))
+    regions = []
+    for start in starts:
+        slot = rng.randrange(slots)
+        regions.append(make_region(slot * 100, 0, start, start + rng.randrange(0, 20)))
+    return regions
+
+
+def test_merge_matches_interval_union():
+    """测试：合并后每帧生效的矩形与按位置合并相接时间段的结果一致"""
+    regions = make_slot_regions(1000)
+    # 参考实现：同一位置上相接或重叠的时间段合并
+    merged = {}
+    for r in regions:
+        spans = merged.setdefault(r.rect, [])
+        if spans and r.start_frame <= spans[-1][1] + 1:
+            spans[-1][1] = max(spans[-1][1], r.end_frame)
+        else:
+            spans.append([r.start_frame, r.end_frame])
+
+    # 合并会修改已有区域的结束帧，原始时间段需事先记录
+    raw_spans = [(r.start_frame, r.end_frame) for r in regions]
+
+    tracker = ActiveRegionTracker(regions, merge_iou=0.5)
+    last_frame = max(end for _, end in raw_spans)
+    for frame_idx in range(last_frame + 2):
+        tracker.active_at(frame_idx)
+        expected = sorted(
+            rect for rect, spans in merged.items()
+            if any(start <= frame_idx <= end for start, end in spans)
+        )
+        assert sorted(tracker.current_rects) == expected, f"第 {frame_idx} 帧不一致"
+        assert tracker.active_count == sum(start <= frame_idx <= end for start, end in raw_spans)
+
+
+def test_merge_build_time_linear():
+    """测试：启用合并时一次性添加大量区域的耗时随区域数近似线性增长"""
+    def build_time(count):
+        best = float('inf')
+        for _ in range(3):
+            # 合并会修改区域，每次重新生成
+            regions = make_slot_regions(count, seed=count)
+            start = time.perf_counter()
+            ActiveRegionTracker(regions, merge_iou=0.5)
+            best = min(best, time.perf_counter() - start)
+        return best
+
+    small = build_time(2000)
+    large = build_time(8000)
+    # 区域数增加 4 倍，平方复杂度时耗时约增加 16 倍
+    assert large < max(small, 1e-3) * 8, f"2000 个区域 {small:.4f}s, 8000 个区域 {large:.4f}s"
+
+
+if __name__ == '__main__':
+    test_matches_linear_scan()
+    test_incremental_add()
+    test_merge_adjacent_regions()
+    test_merge_disabled_keeps_regions()
+    test_current_rects_refresh_after_merge()
+    test_merge_matches_interval_union()
+    test_merge_build_time_linear()
+    print("所有测试通过")
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+测试智能模式采样帧的OCR缓存
+验证感知哈希相同或相近的帧命中缓存，画面变化的帧不命中
+"""
+import numpy as np
+
+from privision.core.video_processor import SampleOCRCache
+
+
+def make_frame(seed: int) -> np.ndarray:
+    """生成由 8x8 色块组成的随机画面"""
+    rng = np.random.RandomState(seed)
+    blocks = rng.randint(0, 256, (8, 8, 3)).astype(np.uint8)
+    return np.kron(blocks, np.ones((16, 16, 1), dtype=np.uint8))
+
+
+def test_identical_frame_hits():
+    """测试：相同画面命中缓存并返回已写入的结果"""
+    cache = SampleOCRCache()
+    frame = make_frame(0)
+
+    key, hit = cache.lookup(frame)
+    assert not hit
+    cache.store(key, ['result'])
+
+    key2, hit2 = cache.lookup(frame.copy())
+    assert hit2
+    assert key2 == key
+    assert cache.get(key2) == ['result']
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_different_frame_misses():
+    """测试：画面变化的帧不命中缓存"""
+    cache = SampleOCRCache()
+    key1, _ = cache.lookup(make_frame(0))
+    cache.store(key1, ['a'])
+
+    key2, hit = cache.lookup(make_frame(1))
+    assert not hit
+    assert key2 != key1
+    cache.store(key2, ['b'])
+    assert cache.get(key1) == ['a']
+    assert cache.get(key2) == ['b']
+    assert (cache.hits, cache.misses) == (0, 2)
+
+
+def test_earlier_frame_hits_after_change():
+    """测试：画面切回之前出现过的内容时仍命中缓存"""
+    cache = SampleOCRCache()
+    key1, _ = cache.lookup(make_frame(0))
+    cache.store(key1, ['a'])
+    cache.lookup(make_frame(1))
+
+    key, hit = cache.lookup(make_frame(0))
+    assert hit
+    assert cache.get(key) == ['a']
+
+
+def test_small_change_reuses_last_key():
+    """测试：与上一帧哈希只差少量位时复用上一帧的结果"""
+    cache = SampleOCRCache(max_distance=2)
+    frame = make_frame(0)
+    key1, _ = cache.lookup(frame)
+    cache.store(key1, ['a'])
+
+    # 翻转一个色块的明暗，哈希变化一位
+    changed = frame.copy()
+    block = changed[:16, :16]
+    block[:] = 255 - block
+    assert bin(SampleOCRCache.average_hash(changed) ^ key1).count('1') == 1
+
+    key2, hit = cache.lookup(changed)
+    assert hit
+    assert key2 == key1
+    assert cache.get(key2) == ['a']
+
+
+def test_distance_zero_requires_exact_hash():
+    """测试：最大汉明距离为0时只有哈希完全相同才命中"""
+    cache = SampleOCRCache(max_distance=0)
+    frame = make_frame(0)
+    key1, _ = cache.lookup(frame)
+
+    changed = frame.copy()
+    changed[:16, :16] = 255 - changed[:16, :16]
+    key2, hit = cache.lookup(changed)
+    assert not hit
+    assert key2 != key1
+
+
+if __name__ == '__main__':
+    test_identical_frame_hits()
+    test_different_frame_misses()
+    test_earlier_frame_hits_after_change()
+    test_small_change_reuses_last_key()
+    test_distance_zero_requires_exact_hash()
+    print("所有测试通过")
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+测试智能采样模式的单遍处理
+验证单遍处理与两遍处理输出的帧和统计信息完全一致
+"""
+import cv2
+import numpy as np
+import pytest
+
+import privision.core.video_processor as video_processor
+from privision.config.args import ProcessConfig
+from privision.core.ocr_detector import OCRDetector
+
+FPS = 10
+TOTAL_FRAMES = 60
+WIDTH, HEIGHT = 160, 120
+# 第 20-39 帧左上角带标记，模拟画面中出现手机号
+MARKED_FRAMES = range(20, 40)
+
+
+class FakeOCRDetector(OCRDetector):
+    """模拟OCR：带标记的帧返回一个手机号和一段无关文本"""
+
+    def __init__(self, *args, **kwargs):
+        self.calls = 0
+
+    def detect_text(self, image, text_filter=None):
+        return self.detect_text_batch([image], text_filter)[0]
+
+    def detect_text_batch(self, images, text_filter=None):
+        results = []
+        for image in images:
+            self.calls += 1
+            detections = []
+            if image[0, 0, 2] > 128:
+                phone = np.array([[20, 20], [80, 20], [80, 35], [20, 35]], dtype=np.float32)
+                other = np.array([[20, 60], [100, 60], [100, 75], [20, 75]], dtype=np.float32)
+                detections = [(phone, '电话13812345678', 0.9), (other, 'hello', 0.8)]
+            if text_filter is not None:
+                detections = [d for d in detections if text_filter(d[1])]
+            results.append(detections)
+        return results
+
+
+class FakeCapture:
+    """按 cv2.VideoCapture 接口从内存读取帧"""
+
+    def __init__(self, frames):
+        self._frames = frames
+        self._pos = 0
+
+    def read(self, image=None):
+        if not self.grab():
+            return False, None
+        return self.retrieve()
+
+    def grab(self):
+        if self._pos >= len(self._frames):
+            return False
+        self._pos += 1
+        return True
+
+    def retrieve(self):
+        return True, self._frames[self._pos - 1].copy()
+
+    def set(self, prop_id, value):
+        if prop_id == cv2.CAP_PROP_POS_FRAMES:
+            self._pos = int(value)
+        return True
+
+
+class FakeWriter:
+    """按 cv2.VideoWriter 接口把帧保存在内存中"""
+
+    def __init__(self):
+        self.frames = []
+
+    def write(self, frame):
+        self.frames.append(frame.copy())
+
+
+def make_frames():
+    """生成带纹理的测试帧"""
+    rng = np.random.RandomState(0)
+    frames = []
+    for i in range(TOTAL_FRAMES):
+        frame = rng.randint(0, 256, (HEIGHT, WIDTH, 3)).astype(np.uint8)
+        frame[:4, :4] = (0, 0, 255) if i in MARKED_FRAMES else (0, 0, 0)
+        frames.append(frame)
+    return frames
+
+
+def run_smart(monkeypatch, **kwargs):
+    """运行一次智能模式处理，返回 (输出帧, 统计信息, OCR调用次数, 是否单遍处理)"""
+    monkeypatch.setattr(video_processor, 'OCRDetector', FakeOCRDetector)
+    single_pass_calls = []
+    original = video_processor.VideoProcessor._single_pass_smart
+    monkeypatch.setattr(
+        video_processor.VideoProcessor, '_single_pass_smart',
+        lambda self, *args: single_pass_calls.append(1) or original(self, *args)
+    )
+    config = ProcessConfig(
+        input_path='in.mp4', output_path='out.mp4', mode='smart',
+        enable_rich=False, **kwargs
+    )
+    processor = video_processor.VideoProcessor(config)
+    frames = make_frames()
+    writer = FakeWriter()
+    frame_bytes = frames[0].nbytes
+    stats = processor._process_smart(FakeCapture(frames), writer, FPS, TOTAL_FRAMES, frame_bytes)
+    return writer.frames, stats, processor.ocr_detector.calls, bool(single_pass_calls)
+
+
+@pytest.mark.parametrize('kwargs', [
+    {},
+    {'sample_interval': 0.5, 'buffer_time': 0.3},
+    {'sample_interval': 0.3, 'ocr_batch_size': 1},
+    {'sample_interval': 0.5, 'sample_hash_cache': True},
+    {'blur_method': 'black'},
+])
+def test_single_pass_matches_two_pass(monkeypatch, kwargs):
+    """测试：单遍处理与两遍处理的输出帧和统计信息一致"""
+    single_frames, single_stats, single_calls, single_pass = run_smart(monkeypatch, **kwargs)
+    two_pass_frames, two_pass_stats, two_pass_calls, two_pass_single = run_smart(
+        monkeypatch, single_pass_max_buffer_mb=0, **kwargs
+    )
+    assert single_pass and not two_pass_single
+
+    assert len(single_frames) == TOTAL_FRAMES
+    assert len(two_pass_frames) == TOTAL_FRAMES
+    for i, (a, b) in enumerate(zip(single_frames, two_pass_frames)):
+        assert np.array_equal(a, b), f"第 {i} 帧不一致"
+
+    single_stats['unique_detections'] = sorted(single_stats['unique_detections'])
+    two_pass_stats['unique_detections'] = sorted(two_pass_stats['unique_detections'])
+    assert single_stats == two_pass_stats
+    assert single_calls == two_pass_calls
+
+
+def test_marked_frames_are_blurred(monkeypatch):
+    """测试：带标记的帧打码，远离标记的帧保持原样"""
+    output, stats, _, _ = run_smart(monkeypatch)
+    frames = make_frames()
+
+    assert not np.array_equal(output[25][20:35, 20:80], frames[25][20:35, 20:80])
+    # 无关文本不打码
+    assert np.array_equal(output[25][60:75, 20:100], frames[25][60:75, 20:100])
+    assert np.array_equal(output[0], frames[0])
+    assert np.array_equal(output[-1], frames[-1])
+    assert stats['unique_detections'] == ['电话13812345678']
+    assert stats['frames_with_detections'] > 0
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
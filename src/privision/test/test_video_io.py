@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+测试后台线程帧读写器和帧缓冲池
+验证帧的顺序、缓冲复用，以及读写线程中的错误能传回处理线程
+"""
+import sys
+
+import numpy as np
+import pytest
+
+from privision.core.video_io import FramePool, ThreadedFrameReader, ThreadedFrameWriter
+
+
+class FakeCapture:
+    """按 cv2.VideoCapture 接口生成编号帧，可在指定帧抛出异常"""
+
+    def __init__(self, count: int, fail_at: int = -1):
+        self._count = count
+        self._fail_at = fail_at
+        self._pos = 0
+        self.reused = 0
+
+    def read(self, image=None):
+        if self._pos == self._fail_at:
+            raise IOError("decode failed")
+        if self._pos >= self._count:
+            return False, None
+        if image is not None:
+            self.reused += 1
+            frame = image
+        else:
+            frame = np.empty((4, 4, 3), dtype=np.uint8)
+        frame[:] = self._pos % 256
+        self._pos += 1
+        return True, frame
+
+
+class FakeWriter:
+    """按 cv2.VideoWriter 接口记录写入帧的编号，可在指定帧抛出异常"""
+
+    def __init__(self, fail_at: int = -1):
+        self._fail_at = fail_at
+        self.written = []
+
+    def write(self, frame):
+        if len(self.written) == self._fail_at:
+            raise IOError("encode failed")
+        self.written.append(int(frame[0, 0, 0]))
+
+
+def test_frame_pool_acquire_release():
+    """测试：归还的帧可再次取出，池空时返回None"""
+    pool = FramePool(max_size=2)
+    assert pool.acquire() is None
+
+    a, b, c = (np.zeros((2, 2), dtype=np.uint8) for _ in range(3))
+    pool.release(a)
+    pool.release(b)
+    pool.release(c)  # 超出上限，丢弃
+
+    taken = [pool.acquire(), pool.acquire()]
+    assert pool.acquire() is None
+    assert {id(f) for f in taken} == {id(a), id(b)}
+
+
+def test_reader_preserves_order():
+    """测试：读取器按解码顺序返回全部帧，结束后持续返回False"""
+    reader = ThreadedFrameReader(FakeCapture(100), queue_size=4)
+    values = []
+    while True:
+        ret, frame = reader.read()
+        if not ret:
+            break
+        values.append(int(frame[0, 0, 0]))
+    assert values == list(range(100))
+    assert reader.read() == (False, None)
+    reader.close()
+
+
+def test_reader_propagates_error():
+    """测试：解码线程的异常在读完已解码的帧后由 read() 抛出"""
+    reader = ThreadedFrameReader(FakeCapture(100, fail_at=10), queue_size=4)
+    values = []
+    with pytest.raises(IOError, match="decode failed"):
+        while True:
+            ret, frame = reader.read()
+            if not ret:
+                break
+            values.append(int(frame[0, 0, 0]))
+    assert values == list(range(10))
+    reader.close()
+
+
+def test_reader_close_early():
+    """测试：未读完时关闭读取器不会阻塞"""
+    reader = ThreadedFrameReader(FakeCapture(1000), queue_size=2)
+    assert reader.read()[0]
+    reader.close()
+
+
+def test_writer_preserves_order():
+    """测试：写入器按提交顺序写出全部帧"""
+    target = FakeWriter()
+    writer = ThreadedFrameWriter(target, queue_size=4)
+    for i in range(100):
+        writer.write(np.full((4, 4, 3), i, dtype=np.uint8))
+    writer.close()
+    assert target.written == list(range(100))
+    # 重复关闭无副作用
+    writer.close()
+
+
+def test_writer_raises_error_on_close():
+    """测试：编码线程的异常在 close() 时抛出，且不阻塞后续写入"""
+    writer = ThreadedFrameWriter(FakeWriter(fail_at=5), queue_size=2)
+    with pytest.raises(IOError, match="encode failed"):
+        for i in range(50):
+            writer.write(np.full((4, 4, 3), i, dtype=np.uint8))
+        writer.close()
+
+
+def test_writer_close_keeps_original_exception():
+    """测试：已有异常传播时，close() 不覆盖原异常"""
+    writer = ThreadedFrameWriter(FakeWriter(fail_at=0), queue_size=2)
+    writer.write(np.zeros((4, 4, 3), dtype=np.uint8))
+
+    with pytest.raises(KeyboardInterrupt) as excinfo:
+        try:
+            raise KeyboardInterrupt
+        finally:
+            writer.close()
+
+    if sys.version_info >= (3, 11):
+        assert any("encode failed" in note for note in excinfo.value.__notes__)
+
+
+def test_reader_writer_share_pool():
+    """测试：读写器共用缓冲池时帧内容和顺序不受复用影响"""
+    pool = FramePool()
+    cap = FakeCapture(200)
+    target = FakeWriter()
+    reader = ThreadedFrameReader(cap, queue_size=4, pool=pool)
+    writer = ThreadedFrameWriter(target, queue_size=4, pool=pool)
+    while True:
+        ret, frame = reader.read()
+        if not ret:
+            break
+        writer.write(frame)
+    reader.close()
+    writer.close()
+
+    assert target.written == [i % 256 for i in range(200)]
+    assert cap.reused > 0
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
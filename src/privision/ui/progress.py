@@ -28,7 +28,7 @@ class ProgressCallback(ABC):
         Args:
             current_frame: 当前处理的帧号
             total_frames: 总帧数
-            phase: 当前阶段 (processing, sampling, blurring)
+            phase: 当前阶段 (processing: 识别与打码同时进行, sampling, blurring, compress)
         """
         pass
 
@@ -53,10 +53,12 @@ class RichUI(ProgressCallback):
         'fire': '🔥',
     }
 
-    # 步骤权重：detection(识别)80%、masking(打码)18%、compression(压缩)2%
+    # 步骤权重：detection(识别)80%、masking(打码)18%、compression(压缩)2%；
+    # 逐帧和单遍处理时识别与打码合并为 processing 步骤，权重为两者之和
     STEP_WEIGHTS = {
         'detection': 0.80,
         'masking': 0.18,
+        'processing': 0.98,
         'compression': 0.02
     }
 
@@ -189,6 +191,11 @@ class RichUI(ProgressCallback):
                     total=100,
                     visible=False
                 ),
+                'processing': self.progress.add_task(
+                    f"[{self.COLORS['info']}]识别与打码",
+                    total=100,
+                    visible=False
+                ),
                 'compression': self.progress.add_task(
                     f"[{self.COLORS['primary']}]压缩输出",
                     total=100,
@@ -218,7 +225,7 @@ class RichUI(ProgressCallback):
         elif phase == 'compress':
             step_name = 'compression'
         else:
-            step_name = 'detection'  # 默认为识别
+            step_name = 'processing'  # 识别与打码同时进行
 
         self.current_step = step_name
 
@@ -357,7 +364,7 @@ class RichUI(ProgressCallback):
         计算总进度
 
         Args:
-            step_name: 当前步骤名称 (detection/masking/compression)
+            step_name: 当前步骤名称 (detection/masking/processing/compression)
             step_progress: 当前步骤进度 (0-100)
 
         Returns:
@@ -482,12 +489,13 @@ class RichUI(ProgressCallback):
         blur_method = self.config.get('blur_method', 'gaussian')
         blur_method_map = {
             'gaussian': '高斯模糊',
+            'gaussian_exact': '精确高斯模糊',
             'pixelate': '像素化',
             'black': '黑色遮挡'
         }
         blur_text = blur_method_map.get(blur_method, blur_method)
 
-        if blur_method == 'gaussian' and 'blur_strength' in self.config:
+        if blur_method in ('gaussian', 'gaussian_exact') and 'blur_strength' in self.config:
             blur_text += f" [{self.COLORS['muted']}](强度: {self.config.get('blur_strength', 51)})[/]"
 
         table.add_row("打码", blur_text)
@@ -124,8 +124,9 @@ class Visualizer:
                 color_rgb = (255, 0, 0) if is_target else (0, 255, 0)
 
                 # 绘制文本标签（使用PIL支持中文）
-                x_min = int(np.min(bbox[:, 0]))
-                y_min = int(np.min(bbox[:, 1]))
+                xs, ys = zip(*bbox.tolist())
+                x_min = int(min(xs))
+                y_min = int(min(ys))
 
                 # 构建标签文本
                 if is_target: